@@ -12,6 +12,14 @@ export default function Admin() {
   );
   const [isLoggedIn, setIsLoggedIn] = useState(false);
   const [messages, setMessages] = useState([]);
+  const [messagesCursor, setMessagesCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [messageSummary, setMessageSummary] = useState({
+    total: 0,
+    unread: 0,
+    replied: 0,
+    today: 0,
+  });
   const [currentUser, setCurrentUser] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
@@ -60,8 +68,8 @@ export default function Admin() {
 
   // Update analytics whenever data changes
   useEffect(() => {
-    updateAnalytics(messages, demoRequests, users);
-  }, [messages, demoRequests, users]);
+    updateAnalytics(messageSummary, demoRequests, users);
+  }, [messageSummary, demoRequests, users]);
 
   const verifyToken = async () => {
     try {
@@ -153,19 +161,46 @@ export default function Admin() {
     }
   };
 
-  const fetchMessages = async (authToken = token) => {
-    setLoading(true);
+  const fetchMessagePage = (authToken, cursor = null) => {
+    const query = new URLSearchParams({ limit: "50" });
+    if (cursor) query.set("cursor", cursor);
+    return fetch(api(`/api/messages?${query}`), {
+      headers: {
+        Authorization: `Bearer ${authToken}`,
+      },
+    });
+  };
+
+  const fetchMessageSummary = async (authToken = token) => {
     try {
-      const response = await fetch(api("/api/messages"), {
+      // Counts come from one aggregate query, not from downloading every message
+      const today = new Date();
+      today.setHours(0, 0, 0, 0);
+      const query = new URLSearchParams({ today_start: today.toISOString() });
+      const response = await fetch(api(`/api/messages/summary?${query}`), {
         headers: {
           Authorization: `Bearer ${authToken}`,
         },
       });
 
       if (response.ok) {
-        const data = await response.json();
-        setMessages(data);
-        // Don't update analytics here, let useEffect handle it
+        setMessageSummary(await response.json());
+      }
+    } catch (err) {
+      console.error("Failed to fetch message summary:", err);
+    }
+  };
+
+  const fetchMessages = async (authToken = token) => {
+    setLoading(true);
+    fetchMessageSummary(authToken);
+    try {
+      // Only the newest page; older pages load on demand with "Load more"
+      const response = await fetchMessagePage(authToken);
+
+      if (response.ok) {
+        setMessages(await response.json());
+        setMessagesCursor(response.headers.get("X-Next-Cursor"));
       } else if (response.status === 401) {
         // Unauthorized - token expired
         setIsLoggedIn(false);
@@ -181,6 +216,25 @@ export default function Admin() {
     }
   };
 
+  const loadMoreMessages = async () => {
+    if (!messagesCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetchMessagePage(token, messagesCursor);
+      if (response.ok) {
+        const page = await response.json();
+        setMessages((current) => current.concat(page));
+        setMessagesCursor(response.headers.get("X-Next-Cursor"));
+      } else {
+        setError("Failed to fetch messages");
+      }
+    } catch (err) {
+      setError("Failed to fetch messages");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchDemoRequests = async (authToken = token) => {
     try {
       const response = await fetch(api("/api/demo-requests"), {
@@ -217,19 +271,12 @@ export default function Admin() {
     }
   };
 
-  const updateAnalytics = (msgs, demos, usrs) => {
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-
+  const updateAnalytics = (summary, demos, usrs) => {
     const stats = {
-      totalMessages: msgs.length,
-      unreadMessages: msgs.filter((m) => !m.is_read).length,
-      repliedMessages: msgs.filter((m) => m.reply_count > 0).length,
-      todayMessages: msgs.filter((m) => {
-        const msgDate = new Date(m.timestamp);
-        msgDate.setHours(0, 0, 0, 0);
-        return msgDate.getTime() === today.getTime();
-      }).length,
+      totalMessages: summary.total,
+      unreadMessages: summary.unread,
+      repliedMessages: summary.replied,
+      todayMessages: summary.today,
       totalDemoRequests: demos.length,
       pendingDemos: demos.filter((d) => d.status === "pending").length,
       totalUsers: usrs.length,
@@ -254,6 +301,7 @@ export default function Admin() {
     setUsername("");
     setPassword("");
     setMessages([]);
+    setMessagesCursor(null);
     setCurrentUser(null);
     localStorage.removeItem("access_token");
   };
@@ -1543,6 +1591,17 @@ export default function Admin() {
                       </div>
                     </div>
                   ))}
+                  {messagesCursor && (
+                    <div className="text-center pt-2">
+                      <button
+                        onClick={loadMoreMessages}
+                        disabled={loadingMore}
+                        className="inline-flex items-center px-6 py-2.5 border border-gray-600 text-sm font-medium rounded-lg text-gray-100 bg-gray-800/50 hover:bg-gray-700/50 disabled:opacity-50 transition-colors"
+                      >
+                        {loadingMore ? "Loading..." : "Load more messages"}
+                      </button>
+                    </div>
+                  )}
                 </div>
               )}
             </>
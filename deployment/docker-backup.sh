@@ -13,12 +13,41 @@ echo "💾 Creating Docker backup..."
 # Create backup directory
 mkdir -p $BACKUP_DIR
 
+# Copy a live SQLite database with the online backup API. The databases run
+# in WAL mode, so copying the .db file alone would miss commits that are
+# still in the -wal file or catch a half-written checkpoint.
+SNAPSHOT_PY='import sqlite3, sys
+src = sqlite3.connect(f"file:{sys.argv[1]}?mode=ro", uri=True)
+dst = sqlite3.connect(sys.argv[2])
+src.backup(dst)
+dst.close()
+src.close()'
+
+backup_sqlite() {
+    local name=$1 dest=$2
+    if docker exec ironhex-api python -c "$SNAPSHOT_PY" /app/data/$name /app/data/.backup-$name 2>/dev/null; then
+        docker cp ironhex-api:/app/data/.backup-$name $dest
+        docker exec ironhex-api rm -f /app/data/.backup-$name
+    elif [ -f $PROJECT_DIR/server/data/$name ]; then
+        python3 -c "$SNAPSHOT_PY" $PROJECT_DIR/server/data/$name $dest
+    else
+        return 1
+    fi
+}
+
 # Backup database from container
 echo "📊 Backing up database..."
-docker cp ironhex-api:/app/data/ironhex.db $BACKUP_DIR/ironhex-db-$TIMESTAMP.db 2>/dev/null || \
-    cp $PROJECT_DIR/server/data/ironhex.db $BACKUP_DIR/ironhex-db-$TIMESTAMP.db 2>/dev/null || \
+backup_sqlite ironhex.db $BACKUP_DIR/ironhex-db-$TIMESTAMP.db || \
     echo "⚠️  Database not found"
 
+# Backup archive database (rows past the retention period), compressed
+echo "🗄️  Backing up archive database..."
+if backup_sqlite ironhex-archive.db $BACKUP_DIR/ironhex-archive-$TIMESTAMP.db; then
+    gzip -f $BACKUP_DIR/ironhex-archive-$TIMESTAMP.db
+else
+    echo "⚠️  Archive database not found"
+fi
+
 # Backup environment file
 echo "⚙️ Backing up configuration..."
 cp $PROJECT_DIR/.env $BACKUP_DIR/env-$TIMESTAMP.backup
@@ -43,6 +72,7 @@ tar --exclude='node_modules' \
 echo "🧹 Cleaning old backups..."
 cd $BACKUP_DIR
 ls -t ironhex-db-*.db 2>/dev/null | tail -n +8 | xargs -r rm
+ls -t ironhex-archive-*.db.gz 2>/dev/null | tail -n +8 | xargs -r rm
 ls -t env-*.backup 2>/dev/null | tail -n +8 | xargs -r rm
 ls -t volumes-*.tar.gz 2>/dev/null | tail -n +8 | xargs -r rm
 ls -t ironhex-full-*.tar.gz 2>/dev/null | tail -n +4 | xargs -r rm
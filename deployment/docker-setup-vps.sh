@@ -72,6 +72,7 @@ if [ ! -f ".env" ]; then
 SECRET_KEY=$(openssl rand -hex 32)
 ALGORITHM=HS256
 ACCESS_TOKEN_EXPIRE_MINUTES=30
+METRICS_TOKEN=$(openssl rand -hex 32)
 SENDGRID_API_KEY=your_sendgrid_api_key_here
 SENDGRID_FROM_EMAIL=noreply@ironhex.com
 CORS_ORIGINS=https://yourdomain.com
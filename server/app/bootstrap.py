@@ -0,0 +1,146 @@
+"""Database Bootstrap
+
+Creates and upgrades the schema and the default super admins. This runs
+exactly once per deployment, before the uvicorn workers start:
+
+    python -m app.bootstrap && uvicorn main:app --workers 4
+
+The bootstrap records a fingerprint of the schema the code expects in the
+schema_version table. At startup each worker only compares that
+fingerprint, which takes one SELECT. When it does not match, for example
+in development where no pre-start step runs, the worker bootstraps the
+database itself. A file lock makes sure only one process does so while the
+others wait and then find the work done.
+"""
+import argparse
+import hashlib
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.config.database import (
+    BASE_DIR, DATABASE_URL, IS_SQLITE, IS_SQLITE_MEMORY, Base, SessionLocal, engine, init_db
+)
+from app.models import SchemaVersion, archive_metadata
+from app.services.search import SEARCH_INDEXES
+from app.utils import initialize_database
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, development only
+    fcntl = None
+
+# Bump when upgrade_schema() or the default data changes in a way the
+# model definitions do not show
+BOOTSTRAP_REVISION = 1
+
+
+def schema_version() -> str:
+    """Fingerprint of the tables, indexes and search indexes this code expects"""
+    digest = hashlib.sha256(f"revision:{BOOTSTRAP_REVISION}".encode("utf-8"))
+    for metadata in (Base.metadata, archive_metadata):
+        for table in metadata.sorted_tables:
+            digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode("utf-8"))
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode("utf-8"))
+    digest.update(repr(sorted(SEARCH_INDEXES.items())).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def database_version() -> Optional[str]:
+    """Schema version recorded in the database, or None before the first bootstrap"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+    except (OperationalError, ProgrammingError):
+        # The schema_version table does not exist yet
+        return None
+
+
+def default_lock_path() -> Path:
+    """Place the lock file next to the main SQLite database"""
+    if IS_SQLITE and not IS_SQLITE_MEMORY:
+        return Path(make_url(DATABASE_URL).database).parent / "bootstrap.lock"
+    return BASE_DIR / "bootstrap.lock"
+
+
+@contextmanager
+def bootstrap_lock():
+    """Exclusive lock shared by every process on this host"""
+    path = default_lock_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def bootstrap(version: str) -> None:
+    """Create/upgrade the schema, create the default data and record the version (caller holds the lock)"""
+    init_db()
+    print("✅ Database initialized")
+
+    db = SessionLocal()
+    try:
+        initialize_database(db)
+        print("✅ Super admins checked/created")
+
+        row = db.get(SchemaVersion, 1)
+        if row is None:
+            db.add(SchemaVersion(id=1, version=version))
+        else:
+            row.version = version
+        db.commit()
+    finally:
+        db.close()
+
+
+def ensure_bootstrapped(force: bool = False) -> bool:
+    """
+    Make sure the database matches this code, bootstrapping it if needed
+
+    Args:
+        force: Bootstrap even when the recorded version matches
+
+    Returns:
+        True if this process ran the bootstrap, False if it was already done
+    """
+    version = schema_version()
+    if not force and database_version() == version:
+        return False
+
+    with bootstrap_lock():
+        # Another process may have finished while we waited for the lock
+        if not force and database_version() == version:
+            return False
+        print(f"🔧 Bootstrapping database (schema {version})...")
+        bootstrap(version)
+        return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bootstrap the database once before starting the workers")
+    parser.add_argument("--force", action="store_true", help="Run even if the schema version already matches")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if ensure_bootstrapped(force=args.force):
+        print(f"✅ Bootstrap complete in {time.perf_counter() - start:.2f}s")
+    else:
+        print(f"✅ Database already at schema {schema_version()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,13 @@
 """Configuration"""
-from .database import Base, engine, SessionLocal, get_db, init_db
+from .database import (
+    Base, engine, SessionLocal, get_db, init_db,
+    async_engine, AsyncSessionLocal, get_async_db,
+    read_async_engine, ReadSessionLocal, get_read_db
+)
 from .settings import settings
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db", "init_db", "settings"]
+__all__ = [
+    "Base", "engine", "SessionLocal", "get_db", "init_db",
+    "async_engine", "AsyncSessionLocal", "get_async_db",
+    "read_async_engine", "ReadSessionLocal", "get_read_db", "settings"
+]
@@ -1,8 +1,14 @@
 """Database Configuration"""
 from pathlib import Path
 import os
-from sqlalchemy import create_engine
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config.settings import settings
 
 # Database path setup
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -14,12 +20,176 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 # Use POSIX path to avoid backslash issues on Windows
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH.as_posix()}")
 
+# Async drivers for the synchronous URL schemes we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Translate a synchronous database URL to its async driver equivalent"""
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        # An explicit driver was configured; keep it
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and make_url(DATABASE_URL).database in (None, "", ":memory:")
+
+
+def pool_options(pool_class) -> dict:
+    """Explicit connection pool settings (in-memory SQLite keeps SQLAlchemy's default pool)"""
+    if IS_SQLITE_MEMORY:
+        return {}
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": not IS_SQLITE,
+    }
+
+
+def apply_sqlite_profile(dbapi_connection, connection_record) -> None:
+    """
+    Apply the SQLite performance profile to every new connection
+
+    WAL lets readers run concurrently with the single writer, busy_timeout
+    makes writers wait for the lock instead of failing with
+    "database is locked", and synchronous=NORMAL is durable in WAL mode
+    except for the last transactions on power loss.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    cursor.close()
+
+
+def configure_sqlite(sync_engine: Engine) -> None:
+    """Register the SQLite profile on an engine"""
+    if IS_SQLITE and not IS_SQLITE_MEMORY:
+        event.listen(sync_engine, "connect", apply_sqlite_profile)
+
+
 # SQLAlchemy setup
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **pool_options(QueuePool))
+configure_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async SQLAlchemy setup used by the request handlers
+# expire_on_commit=False keeps loaded attributes usable after commit without
+# an implicit (blocking) refresh
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=connect_args,
+    **pool_options(AsyncAdaptedQueuePool)
+)
+configure_sqlite(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def apply_query_only(dbapi_connection, connection_record) -> None:
+    """Refuse writes on read-engine connections (SQLite)"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def create_read_engine():
+    """
+    Engine for GET admin routes, or None to read through the primary engine
+
+    READ_DATABASE_URL selects a replica. Otherwise a file-based SQLite
+    database gets a second pool on the same file: WAL readers never block
+    the writer, and the separate pool keeps long admin queries from holding
+    the connections public writes need. Reads on the same file see every
+    committed write, so they need no read-your-writes handling.
+    """
+    if settings.READ_DATABASE_URL:
+        url = settings.READ_DATABASE_URL
+    elif settings.DB_READ_ENGINE and IS_SQLITE and not IS_SQLITE_MEMORY:
+        url = DATABASE_URL
+    else:
+        return None
+
+    is_sqlite = url.startswith("sqlite")
+    read_engine = create_async_engine(
+        get_async_database_url(url),
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        **{**pool_options(AsyncAdaptedQueuePool), "pool_size": settings.DB_READ_POOL_SIZE}
+    )
+    if is_sqlite:
+        event.listen(read_engine.sync_engine, "connect", apply_sqlite_profile)
+        event.listen(read_engine.sync_engine, "connect", apply_query_only)
+    return read_engine
+
+
+read_async_engine = create_read_engine()
+ReadSessionLocal = async_sessionmaker(
+    bind=read_async_engine or async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Request header asking GET routes to read from the primary instead of a
+# (possibly lagging) replica, e.g. right after the client's own write
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+
+def default_archive_db_path() -> str:
+    """Place the archive next to the main SQLite database as <name>-archive.db"""
+    main_db = Path(make_url(DATABASE_URL).database)
+    return str(main_db.with_name(f"{main_db.stem}-archive{main_db.suffix or '.db'}"))
+
+
+# Archive database for rows past the retention period. It is a separate
+# SQLite file so the hot database (and its backups) stays small; the archiver
+# ATTACHes it to a main-database connection and moves rows with plain SQL.
+ARCHIVE_ENABLED = IS_SQLITE and not IS_SQLITE_MEMORY
+ARCHIVE_DB_PATH = (settings.ARCHIVE_DB_PATH or default_archive_db_path()) if ARCHIVE_ENABLED else None
+
+# Archive tables live in the "archive" schema (the ATTACH alias); connections
+# opened on the archive file itself see them as plain tables
+ARCHIVE_SCHEMA_MAP = {"archive": None}
+
+if ARCHIVE_ENABLED:
+    _archive_engine = create_engine(
+        f"sqlite:///{ARCHIVE_DB_PATH}", connect_args=connect_args, **pool_options(QueuePool)
+    )
+    configure_sqlite(_archive_engine)
+    archive_engine = _archive_engine.execution_options(schema_translate_map=ARCHIVE_SCHEMA_MAP)
+    _archive_async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{ARCHIVE_DB_PATH}", connect_args=connect_args, **pool_options(AsyncAdaptedQueuePool)
+    )
+    configure_sqlite(_archive_async_engine.sync_engine)
+    archive_async_engine = _archive_async_engine.execution_options(schema_translate_map=ARCHIVE_SCHEMA_MAP)
+    ArchiveSessionLocal = async_sessionmaker(
+        bind=archive_async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    archive_engine = archive_async_engine = ArchiveSessionLocal = None
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -30,7 +200,47 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """
+    Dependency for read-only routes: a session on the read engine
+
+    Requests sent with "X-Read-Consistency: primary" read from the primary
+    instead, so a client can see its own write on a lagging replica.
+    """
+    if request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables"""
-    from app.models import Message, MessageReply, User, DemoRequest
+    from app.models import Message, MessageReply, User, DemoRequest, EmailOutbox, Event, SchemaVersion, StreamTicket
+    from app.utils.migrations import upgrade_schema
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    init_archive_db()
+
+
+async def get_archive_db():
+    """Dependency for getting an async session on the archive database"""
+    if ArchiveSessionLocal is None:
+        raise HTTPException(status_code=503, detail="The archive requires a file-based SQLite database")
+    async with ArchiveSessionLocal() as db:
+        yield db
+
+
+def init_archive_db():
+    """Create the archive tables (no-op when archiving is unavailable)"""
+    if archive_engine is None:
+        return
+    from app.models.archive import archive_metadata
+    archive_metadata.create_all(bind=archive_engine)
@@ -15,8 +15,62 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
     
+    # Authenticated user cache (per worker; 0 disables)
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "256"))
+    USER_CACHE_GENERATION_PATH: str = os.getenv("USER_CACHE_GENERATION_PATH", "")
+    
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+    
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    
+    # Read engine for GET admin routes: READ_DATABASE_URL points at a replica;
+    # without it a file-based SQLite database gets a second, query_only pool
+    READ_DATABASE_URL: str = os.getenv("READ_DATABASE_URL", "")
+    DB_READ_ENGINE: bool = os.getenv("DB_READ_ENGINE", "True").lower() == "true"
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+    
+    # SQLite profile applied to every connection
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-20000"))  # negative = KiB
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    
+    # Retention: messages, replies and demo requests untouched for
+    # ARCHIVE_AFTER_DAYS move to a separate archive database (SQLite only; 0 disables)
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    ARCHIVE_INTERVAL_HOURS: float = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24"))
+    ARCHIVE_DB_PATH: str = os.getenv("ARCHIVE_DB_PATH", "")
+    
+    # Rate limiting ("sqlite" shares counters across worker processes, "memory" is per process)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "sqlite").lower()
+    RATE_LIMIT_DB_PATH: str = os.getenv("RATE_LIMIT_DB_PATH", "")
+    RATE_LIMIT_BUSY_TIMEOUT_MS: int = int(os.getenv("RATE_LIMIT_BUSY_TIMEOUT_MS", "200"))
+    RATE_LIMIT_CLEANUP_INTERVAL_MINUTES: float = float(os.getenv("RATE_LIMIT_CLEANUP_INTERVAL_MINUTES", "60"))
+    
+    # Server-Sent Events for admin dashboards
+    EVENTS_POLL_SECONDS: float = float(os.getenv("EVENTS_POLL_SECONDS", "1"))
+    EVENTS_KEEPALIVE_SECONDS: float = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+    EVENTS_RETENTION_HOURS: int = int(os.getenv("EVENTS_RETENTION_HOURS", "24"))
+    
+    # Prometheus metrics (/metrics); the directory is shared by all workers
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+    
+    # SQL instrumentation: statements slower than this are logged in DEBUG;
+    # QUERY_BUDGET_ENFORCE answers requests over their @query_budget with 500
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+    QUERY_BUDGET_ENFORCE: bool = os.getenv("QUERY_BUDGET_ENFORCE", "False").lower() == "true"
     
     # CORS
     VITE_DEV_ORIGIN: str = os.getenv("VITE_DEV_ORIGIN", "http://localhost:5173")
@@ -25,11 +79,26 @@ class Settings:
     SENDGRID_API_KEY: str = os.getenv("SENDGRID_API_KEY", "")
     SENDGRID_FROM_EMAIL: str = os.getenv("SENDGRID_FROM_EMAIL", "noreply@ironhex-tech.com")
     SENDGRID_FROM_NAME: str = os.getenv("SENDGRID_FROM_NAME", "IRONHEX")
+    # Point at a local stand-in server for load tests
+    SENDGRID_API_BASE_URL: str = os.getenv("SENDGRID_API_BASE_URL", "https://api.sendgrid.com")
+    
+    # Outbound email HTTP transport (per worker)
+    EMAIL_HTTP_MAX_CONNECTIONS: int = int(os.getenv("EMAIL_HTTP_MAX_CONNECTIONS", "10"))
+    EMAIL_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("EMAIL_HTTP_TIMEOUT_SECONDS", "10"))
+    EMAIL_HTTP_MAX_RETRIES: int = int(os.getenv("EMAIL_HTTP_MAX_RETRIES", "3"))
     
     # Email Recipients
     NOTIFICATION_EMAIL: str = os.getenv("EMAIL_TO", "contact@ironhex-tech.com")
     SUPPORT_EMAIL: str = os.getenv("SUPPORT_EMAIL", "support@ironhex-tech.com")
     
+    # Email outbox dispatcher
+    EMAIL_OUTBOX_BATCH_SIZE: int = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+    EMAIL_OUTBOX_POLL_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30"))
+    EMAIL_OUTBOX_LEASE_SECONDS: int = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+    EMAIL_OUTBOX_RETENTION_DAYS: float = float(os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", "7"))
+    
     # Application
     APP_NAME: str = "IRONHEX Messages API"
     APP_VERSION: str = "2.0.0"
@@ -54,6 +123,10 @@ class Settings:
             if not self.DATABASE_URL:
                 errors.append("❌ DATABASE_URL is not set!")
             
+            # /metrics is served on the public port; never leave it open
+            if self.METRICS_ENABLED and not self.METRICS_TOKEN:
+                errors.append("❌ METRICS_TOKEN is not set! Set a token or disable metrics with METRICS_ENABLED=False.")
+            
             # Check SendGrid (if email features are used)
             if not self.SENDGRID_API_KEY:
                 print("⚠️  WARNING: SENDGRID_API_KEY is not set. Email features will not work.")
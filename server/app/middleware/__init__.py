@@ -1,5 +1,10 @@
 """Security middleware package"""
 from .rate_limit import check_rate_limit, rate_limiter
 from .security_headers import SecurityHeadersMiddleware
+from .metrics import MetricsMiddleware
+from .query_debug import QueryDebugMiddleware
 
-__all__ = ['check_rate_limit', 'rate_limiter', 'SecurityHeadersMiddleware']
+__all__ = [
+    'check_rate_limit', 'rate_limiter', 'SecurityHeadersMiddleware', 'MetricsMiddleware',
+    'QueryDebugMiddleware'
+]
@@ -0,0 +1,91 @@
+"""SQL query debugging middleware"""
+import json
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.utils.query_stats import BUDGET_ITEMS_SCOPE_KEY, QueryStats, get_query_budget, track_queries
+
+QUERY_COUNT_HEADER = b"x-db-query-count"
+QUERY_TIME_HEADER = b"x-db-time-ms"
+
+
+def _short(sql: str, limit: int = 160) -> str:
+    return " ".join(sql.split())[:limit]
+
+
+class QueryDebugMiddleware:
+    """
+    Report the SQL each request executed
+
+    Adds X-DB-Query-Count and X-DB-Time-Ms to every response (counting the
+    statements run before the response started), and logs slow statements,
+    statements repeated enough to suggest an N+1 query, and endpoints that
+    exceed their @query_budget. With enforce=True a request over budget is
+    answered with 500 instead, so test runs fail on regressions.
+    """
+
+    def __init__(self, app: ASGIApp, enforce: bool = False):
+        self.app = app
+        self.enforce = enforce
+
+    def _budget(self, scope: Scope):
+        route = scope.get("route")
+        if route is None:
+            return None
+        return get_query_budget(getattr(route, "endpoint", None), scope.get(BUDGET_ITEMS_SCOPE_KEY, 0))
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        request = f"{scope['method']} {scope['path']}"
+        for sql, duration in stats.slow:
+            print(f"🐢 Slow query ({duration * 1000:.1f} ms) in {request}: {_short(sql)}")
+        for sql, n in stats.repeated():
+            print(f"⚠️  Possible N+1 in {request}: {n}x {_short(sql)}")
+        budget = self._budget(scope)
+        if budget is not None and stats.count > budget:
+            print(f"❌ Query budget exceeded in {request}: {stats.count} > {budget}\n{stats.summary()}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        over_budget = False
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                nonlocal over_budget
+                if message["type"] == "http.response.start":
+                    budget = self._budget(scope)
+                    if self.enforce and budget is not None and stats.count > budget:
+                        over_budget = True
+                        body = json.dumps({
+                            "detail": f"Query budget exceeded: {stats.count} > {budget}",
+                            "queries": stats.summary(),
+                        }).encode("utf-8")
+                        await send({
+                            "type": "http.response.start",
+                            "status": 500,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode("latin-1")),
+                            ],
+                        })
+                        await send({"type": "http.response.body", "body": body})
+                        return
+                    headers = [
+                        (name, value) for name, value in message.get("headers", [])
+                        if name.lower() not in (QUERY_COUNT_HEADER, QUERY_TIME_HEADER)
+                    ]
+                    headers.append((QUERY_COUNT_HEADER, str(stats.count).encode("latin-1")))
+                    headers.append((QUERY_TIME_HEADER, f"{stats.duration * 1000:.2f}".encode("latin-1")))
+                    message = {**message, "headers": headers}
+                elif over_budget:
+                    # The replacement response was already sent
+                    return
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+        if settings.DEBUG or self.enforce:
+            self._report(scope, stats)
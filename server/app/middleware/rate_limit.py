@@ -1,55 +1,77 @@
 """Rate limiting middleware to prevent brute force attacks"""
+from abc import ABC, abstractmethod
 from fastapi import Request, HTTPException, status
 from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 import asyncio
+import sqlite3
+import threading
+import time
 
+from sqlalchemy.engine import make_url
 
-class RateLimiter:
-    """Simple in-memory rate limiter"""
-    
-    def __init__(self):
-        # Store: {identifier: [(timestamp, count)]}
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.lock = asyncio.Lock()
-    
-    async def is_rate_limited(
-        self,
-        identifier: str,
-        max_requests: int = 5,
-        window_seconds: int = 300  # 5 minutes
-    ) -> Tuple[bool, int]:
+from app.config.database import BASE_DIR, DATABASE_URL
+from app.config.settings import settings
+from app.services.metrics import RATE_LIMIT_REJECTIONS
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for rate limit hits
+
+    Backends keep a sliding window log of hit timestamps per identifier.
+    hit() must check and record atomically so that concurrent callers
+    (including other worker processes, for shared backends) cannot both
+    slip under the limit.
+    """
+
+    @abstractmethod
+    def hit(self, identifier: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
         """
-        Check if identifier has exceeded rate limit
+        Record a request for identifier unless it is over the limit
         Returns (is_limited, requests_made)
         """
-        async with self.lock:
-            now = datetime.utcnow()
-            cutoff = now - timedelta(seconds=window_seconds)
-            
+
+    @abstractmethod
+    def cleanup(self, max_age_seconds: int) -> None:
+        """Drop hits older than max_age_seconds"""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process in-memory storage (tests and single-worker development)"""
+
+    def __init__(self):
+        # Store: {identifier: [timestamp, ...]}
+        self.requests: Dict[str, list] = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def hit(self, identifier: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+        with self.lock:
+            now = time.time()
+            cutoff = now - window_seconds
+
             # Clean old entries
             self.requests[identifier] = [
                 ts for ts in self.requests[identifier]
                 if ts > cutoff
             ]
-            
+
             # Check current count
             current_count = len(self.requests[identifier])
-            
+
             if current_count >= max_requests:
                 return True, current_count
-            
+
             # Add new request timestamp
             self.requests[identifier].append(now)
             return False, current_count + 1
-    
-    async def cleanup_old_entries(self, max_age_hours: int = 24):
-        """Periodically clean up old entries to prevent memory bloat"""
-        async with self.lock:
-            cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+
+    def cleanup(self, max_age_seconds: int) -> None:
+        with self.lock:
+            cutoff = time.time() - max_age_seconds
             identifiers_to_remove = []
-            
+
             for identifier, timestamps in self.requests.items():
                 # Remove old timestamps
                 self.requests[identifier] = [
@@ -58,14 +80,176 @@ class RateLimiter:
                 # Mark empty lists for removal
                 if not self.requests[identifier]:
                     identifiers_to_remove.append(identifier)
-            
+
             # Remove empty entries
             for identifier in identifiers_to_remove:
                 del self.requests[identifier]
 
 
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    SQLite storage shared by every worker process on the host
+
+    Each check is a single short IMMEDIATE transaction on a small WAL-mode
+    database, which serializes concurrent workers without blocking readers
+    and costs well under a millisecond. A check waits at most
+    busy_timeout_ms for another worker's lock; past that the request is not
+    limited (fail open), so a stuck counter database never stalls logins.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 200):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conn = None
+        self.lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the connection lazily so it is created inside the worker process"""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,  # explicit BEGIN/COMMIT below
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Counters are disposable; skip fsync on every commit
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_hits ("
+                "identifier TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limit_hits_identifier_ts "
+                "ON rate_limit_hits (identifier, ts)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def hit(self, identifier: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+        with self.lock:
+            conn = self.conn
+            now = time.time()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                print(f"⚠️  Rate limit check skipped (fail open): {e}")
+                return False, 0
+            try:
+                conn.execute(
+                    "DELETE FROM rate_limit_hits WHERE identifier = ? AND ts <= ?",
+                    (identifier, now - window_seconds)
+                )
+                current_count = conn.execute(
+                    "SELECT COUNT(*) FROM rate_limit_hits WHERE identifier = ?",
+                    (identifier,)
+                ).fetchone()[0]
+
+                if current_count >= max_requests:
+                    conn.execute("COMMIT")
+                    return True, current_count
+
+                conn.execute(
+                    "INSERT INTO rate_limit_hits (identifier, ts) VALUES (?, ?)",
+                    (identifier, now)
+                )
+                conn.execute("COMMIT")
+                return False, current_count + 1
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def cleanup(self, max_age_seconds: int) -> None:
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM rate_limit_hits WHERE ts <= ?",
+                (time.time() - max_age_seconds,)
+            )
+
+
+def default_rate_limit_db_path() -> str:
+    """Place the shared counter database next to the main SQLite database"""
+    url = make_url(DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+        return str(Path(url.database).parent / "ratelimit.db")
+    return str(BASE_DIR / "ratelimit.db")
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Build the backend selected by RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimitBackend()
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteRateLimitBackend(
+            settings.RATE_LIMIT_DB_PATH or default_rate_limit_db_path(),
+            busy_timeout_ms=settings.RATE_LIMIT_BUSY_TIMEOUT_MS
+        )
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+
+
+class RateLimiter:
+    """
+    Sliding window rate limiter over a pluggable storage backend
+
+    Backend calls block (SQLite I/O and locks), so they run in a worker
+    thread instead of on the event loop. start() schedules
+    cleanup_old_entries every cleanup_interval_minutes.
+    """
+
+    def __init__(self, backend: RateLimitBackend, cleanup_interval_minutes: float = 60):
+        self.backend = backend
+        self.cleanup_interval_minutes = cleanup_interval_minutes
+        self._task: Optional[asyncio.Task] = None
+
+    async def is_rate_limited(
+        self,
+        identifier: str,
+        max_requests: int = 5,
+        window_seconds: int = 300  # 5 minutes
+    ) -> Tuple[bool, int]:
+        """
+        Check if identifier has exceeded rate limit
+        Returns (is_limited, requests_made)
+        """
+        return await asyncio.to_thread(self.backend.hit, identifier, max_requests, window_seconds)
+
+    async def cleanup_old_entries(self, max_age_hours: int = 24):
+        """Periodically clean up old entries to prevent memory bloat"""
+        await asyncio.to_thread(self.backend.cleanup, max_age_hours * 3600)
+
+    def start(self) -> None:
+        """Start the cleanup loop in the running event loop"""
+        if self.cleanup_interval_minutes > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the cleanup loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval_minutes * 60)
+            try:
+                await self.cleanup_old_entries()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Rate limit cleanup error: {e}")
+
+
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(
+    create_rate_limit_backend(),
+    cleanup_interval_minutes=settings.RATE_LIMIT_CLEANUP_INTERVAL_MINUTES
+)
 
 
 async def check_rate_limit(
@@ -97,6 +281,7 @@ async def check_rate_limit(
     )
     
     if is_limited:
+        RATE_LIMIT_REJECTIONS.labels(request.url.path).inc()
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Too many requests. Please try again later. ({count}/{max_requests} requests in {window_seconds}s)",
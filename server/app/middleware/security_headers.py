@@ -1,14 +1,13 @@
 """Security headers middleware"""
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.config.settings import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+def build_security_headers(debug: bool) -> list[tuple[bytes, bytes]]:
     """
-    Add security headers to all responses
-    
+    Build the encoded security header block for DEBUG or production mode
+
     Headers added:
     - Strict-Transport-Security (HSTS)
     - X-Content-Type-Options
@@ -18,27 +17,51 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Permissions-Policy
     - Content-Security-Policy (strict)
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
-        
+    # Content Security Policy - Strict and secure
+    # Note: This is for the API. Frontend should have its own CSP via meta tag or CDN
+    if debug:
+        # Development mode - more relaxed for debugging
+        csp = (
+            "default-src 'self'; "
+            "script-src 'self'; "
+            "style-src 'self'; "
+            "font-src 'self'; "
+            "img-src 'self' data:; "
+            "connect-src 'self' http://localhost:* https://api.ironhex-tech.com; "
+            "frame-ancestors 'none'; "
+            "base-uri 'self'; "
+            "form-action 'self'; "
+            "object-src 'none'"
+        )
+    else:
+        # Production mode - strict policy
+        csp = (
+            "default-src 'self'; "
+            "script-src 'self'; "
+            "style-src 'self'; "
+            "font-src 'self'; "
+            "img-src 'self'; "
+            "connect-src 'self' https://api.ironhex-tech.com https://ironhexwebsite-production.up.railway.app; "
+            "frame-ancestors 'none'; "
+            "base-uri 'self'; "
+            "form-action 'self'; "
+            "object-src 'none'; "
+            "upgrade-insecure-requests"
+        )
+
+    headers = {
         # HSTS - Force HTTPS for 1 year
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
+        "strict-transport-security": "max-age=31536000; includeSubDomains",
         # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
+        "x-content-type-options": "nosniff",
         # Prevent clickjacking - SAMEORIGIN allows framing by same origin
-        response.headers["X-Frame-Options"] = "SAMEORIGIN"
-        
+        "x-frame-options": "SAMEORIGIN",
         # XSS Protection (legacy, but still useful for older browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
+        "x-xss-protection": "1; mode=block",
         # Referrer Policy - Only send origin when navigating to different origins
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
+        "referrer-policy": "strict-origin-when-cross-origin",
         # Permissions Policy - Disable unnecessary browser features
-        response.headers["Permissions-Policy"] = (
+        "permissions-policy": (
             "geolocation=(), "
             "microphone=(), "
             "camera=(), "
@@ -47,41 +70,40 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "magnetometer=(), "
             "gyroscope=(), "
             "accelerometer=()"
-        )
-        
-        # Content Security Policy - Strict and secure
-        # Note: This is for the API. Frontend should have its own CSP via meta tag or CDN
-        if settings.DEBUG:
-            # Development mode - more relaxed for debugging
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self'; "
-                "style-src 'self'; "
-                "font-src 'self'; "
-                "img-src 'self' data:; "
-                "connect-src 'self' http://localhost:* https://api.ironhex-tech.com; "
-                "frame-ancestors 'none'; "
-                "base-uri 'self'; "
-                "form-action 'self'; "
-                "object-src 'none'"
-            )
-        else:
-            # Production mode - strict policy
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self'; "
-                "style-src 'self'; "
-                "font-src 'self'; "
-                "img-src 'self'; "
-                "connect-src 'self' https://api.ironhex-tech.com https://ironhexwebsite-production.up.railway.app; "
-                "frame-ancestors 'none'; "
-                "base-uri 'self'; "
-                "form-action 'self'; "
-                "object-src 'none'; "
-                "upgrade-insecure-requests"
-            )
-        
-        response.headers["Content-Security-Policy"] = csp
-        
-        return response
+        ),
+        "content-security-policy": csp,
+    }
+    return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+class SecurityHeadersMiddleware:
+    """
+    Add security headers to all HTTP responses
+
+    Implemented as a plain ASGI middleware: the encoded header block is built
+    once at startup and appended to the `http.response.start` message, so
+    there is no per-request task, body streaming copy or string formatting.
+    """
+
+    def __init__(self, app: ASGIApp, debug: Optional[bool] = None):
+        self.app = app
+        self.headers = build_security_headers(settings.DEBUG if debug is None else debug)
+        self.header_names = {name for name, _ in self.headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Our values replace any the endpoint set for the same headers
+                headers = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in self.header_names
+                ]
+                headers.extend(self.headers)
+                message["headers"] = headers
+            await send(message)
 
+        await self.app(scope, receive, send_with_headers)
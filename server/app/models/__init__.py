@@ -2,5 +2,13 @@
 from .message import Message, MessageReply
 from .user import User
 from .demo import DemoRequest
+from .outbox import EmailOutbox
+from .event import Event
+from .schema_version import SchemaVersion
+from .stream_ticket import StreamTicket
+from .archive import archive_metadata, archived_messages, archived_message_replies, archived_demo_requests
 
-__all__ = ["Message", "MessageReply", "User", "DemoRequest"]
+__all__ = [
+    "Message", "MessageReply", "User", "DemoRequest", "EmailOutbox", "Event", "SchemaVersion", "StreamTicket",
+    "archive_metadata", "archived_messages", "archived_message_replies", "archived_demo_requests"
+]
@@ -0,0 +1,38 @@
+"""Archive Database Tables
+
+Copies of the messages, message_replies and demo_requests tables in the
+separate archive database, with an archived_at column added. They keep the
+original ids and have no foreign keys, since users stay in the main
+database. The tables use the "archive" schema so the same definitions work
+on a main-database connection with the archive ATTACHed and on the archive
+engine, which maps the schema away.
+"""
+from sqlalchemy import Column, DateTime, Index, MetaData, Table
+
+from .demo import DemoRequest
+from .message import Message, MessageReply
+
+archive_metadata = MetaData(schema="archive")
+
+
+def _archive_table(source: Table, *indexes: tuple[str, ...]) -> Table:
+    """Archive copy of a table: same columns (no constraints) plus archived_at"""
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in source.columns
+    ]
+    table = Table(source.name, archive_metadata, *columns, Column("archived_at", DateTime, nullable=False))
+    for index_columns in indexes:
+        Index(f"ix_archive_{source.name}_{'_'.join(index_columns)}", *(table.c[name] for name in index_columns))
+    return table
+
+
+archived_messages = _archive_table(
+    Message.__table__, ("timestamp", "id"), ("email", "timestamp", "id")
+)
+archived_message_replies = _archive_table(
+    MessageReply.__table__, ("message_id", "sent_at")
+)
+archived_demo_requests = _archive_table(
+    DemoRequest.__table__, ("timestamp", "id")
+)
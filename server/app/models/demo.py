@@ -1,5 +1,5 @@
 """Demo Request Database Model"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
 from app.config.database import Base
 import datetime
 
@@ -7,6 +7,13 @@ import datetime
 class DemoRequest(Base):
     """Demo requests from potential clients"""
     __tablename__ = 'demo_requests'
+    __table_args__ = (
+        # Admin list: newest first, optionally filtered by status
+        Index('ix_demo_requests_timestamp_id', 'timestamp', 'id'),
+        Index('ix_demo_requests_status_timestamp_id', 'status', 'timestamp', 'id'),
+        # Never reuse the id of an archived (deleted) newest row
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     platform_id = Column(String(100), nullable=False)
@@ -23,3 +30,5 @@ class DemoRequest(Base):
     status = Column(String(50), default='pending')
     demo_scheduled_at = Column(DateTime, nullable=True)
     notes = Column(Text, nullable=True)
+    # Bumped on every change; max(updated_at) is part of the list ETag
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
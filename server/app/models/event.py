@@ -0,0 +1,22 @@
+"""Admin Event Database Model"""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.config.database import Base
+import datetime
+
+
+class Event(Base):
+    """
+    Append-only log of admin-visible changes
+
+    Written in the same transaction as the change itself and streamed to
+    dashboards over Server-Sent Events; the id doubles as the SSE event id.
+    """
+    __tablename__ = 'events'
+    # Never reuse ids: after pruning empties the table, a plain INTEGER
+    # PRIMARY KEY would restart at 1, below every Last-Event-ID in use
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    type = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON encoded
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
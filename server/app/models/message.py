@@ -1,5 +1,5 @@
 """Message Database Models"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 import datetime
@@ -8,6 +8,14 @@ import datetime
 class Message(Base):
     """Contact message from website visitors"""
     __tablename__ = 'messages'
+    __table_args__ = (
+        # Admin inbox: newest first, optionally filtered by read state or sender
+        Index('ix_messages_timestamp_id', 'timestamp', 'id'),
+        Index('ix_messages_is_read_timestamp_id', 'is_read', 'timestamp', 'id'),
+        Index('ix_messages_email_timestamp_id', 'email', 'timestamp', 'id'),
+        # Never reuse the id of an archived (deleted) newest row
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
@@ -19,6 +27,8 @@ class Message(Base):
     is_read = Column(Boolean, default=False)
     read_by_admin_id = Column(Integer, ForeignKey('users.id'), nullable=True)
     read_at = Column(DateTime, nullable=True)
+    # Bumped on every change; max(updated_at) is part of the list ETag
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
     
     # Relationships
     replies = relationship("MessageReply", back_populates="message", cascade="all, delete-orphan")
@@ -28,6 +38,12 @@ class Message(Base):
 class MessageReply(Base):
     """Admin replies to contact messages"""
     __tablename__ = 'message_replies'
+    __table_args__ = (
+        # Replies of one message in send order, and reply counts per message
+        Index('ix_message_replies_message_id_sent_at', 'message_id', 'sent_at'),
+        Index('ix_message_replies_admin_id', 'admin_id'),
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     message_id = Column(Integer, ForeignKey('messages.id'), nullable=False)
@@ -36,6 +52,7 @@ class MessageReply(Base):
     reply_subject = Column(String(300), nullable=False)
     reply_body = Column(Text, nullable=False)
     sent_at = Column(DateTime, default=datetime.datetime.utcnow)
+    delivered = Column(Boolean, default=False)
     
     # Relationships
     message = relationship("Message", back_populates="replies")
@@ -0,0 +1,30 @@
+"""Email Outbox Database Model"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from app.config.database import Base
+import datetime
+
+
+class EmailOutbox(Base):
+    """Emails waiting to be sent by the outbox dispatcher"""
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+        Index('ix_email_outbox_status_claimed_until', 'status', 'claimed_until'),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON encoded keyword arguments
+    status = Column(String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    claimed_by = Column(String(64), nullable=True)
+    claimed_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+    
+    # Records whose delivery status is updated once the email is sent
+    message_id = Column(Integer, ForeignKey('messages.id'), nullable=True)
+    reply_id = Column(Integer, ForeignKey('message_replies.id'), nullable=True)
+    demo_request_id = Column(Integer, ForeignKey('demo_requests.id'), nullable=True)
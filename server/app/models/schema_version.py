@@ -0,0 +1,18 @@
+"""Schema Version Database Model"""
+from sqlalchemy import Column, Integer, String, DateTime
+from app.config.database import Base
+import datetime
+
+
+class SchemaVersion(Base):
+    """
+    Single row recording the schema the database was last bootstrapped to
+
+    Written by app.bootstrap once the schema and default data are in place;
+    workers compare it with the version of the code they run.
+    """
+    __tablename__ = 'schema_version'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(String(64), nullable=False)
+    applied_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
@@ -0,0 +1,19 @@
+"""Stream Ticket Database Model"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.config.database import Base
+
+
+class StreamTicket(Base):
+    """
+    Short-lived, single-use credential for opening one admin event stream
+
+    EventSource cannot send an Authorization header, so the dashboard
+    exchanges its JWT for a ticket and puts the ticket in the stream URL
+    instead. Only the SHA-256 of the ticket is stored; redeeming deletes
+    the row, so a ticket that leaks through an access log is already spent.
+    """
+    __tablename__ = 'stream_tickets'
+    
+    ticket_hash = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -17,10 +17,12 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     is_super_admin = Column(Boolean, default=False)
     must_change_password = Column(Boolean, default=False)
-    reset_token = Column(String(200), nullable=True)
+    reset_token = Column(String(200), nullable=True, index=True)
     reset_token_expiry = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
     last_login = Column(DateTime, nullable=True)
+    # Bumped on every change; max(updated_at) is part of the list ETag
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
     
     # Relationships
     message_replies = relationship("MessageReply", back_populates="admin")
@@ -0,0 +1,137 @@
+"""Archive API Router
+
+Read access to rows the retention policy moved out of the main database.
+The archive is only queried through these endpoints, so the regular admin
+lists never pay for it.
+"""
+import asyncio
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import get_archive_db
+from app.models import User, archived_demo_requests, archived_message_replies, archived_messages
+from app.schemas import ArchivedDemoRequestOut, ArchivedMessageOut, ArchivedMessageReplyOut, ArchiveRunResult
+from app.services.archive import archive_older_than, retention_cutoff
+from app.services.auth import get_current_admin_user
+from app.utils.fast_json import json_rows, schema_columns
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+)
+from app.utils.query_stats import query_budget
+
+router = APIRouter(prefix="/api/archive", tags=["archive"])
+
+
+async def _newest_first_page(
+    db: AsyncSession,
+    query,
+    table,
+    cursor: Optional[str],
+    limit: int,
+    response: Response
+) -> Response:
+    """Run one keyset page ordered by (timestamp, id) descending and encode it"""
+    if cursor:
+        try:
+            last_timestamp, last_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(or_(
+            table.c.timestamp < last_timestamp,
+            and_(table.c.timestamp == last_timestamp, table.c.id < last_id)
+        ))
+
+    result = await db.execute(
+        query.order_by(table.c.timestamp.desc(), table.c.id.desc()).limit(limit + 1)
+    )
+    keys = list(result.keys())
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return json_rows(keys, rows, response)
+
+
+@router.get("/messages", response_model=list[ArchivedMessageOut])
+@query_budget(2)
+async def list_archived_messages(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor returned in the X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[datetime] = Query(None, description="Only messages received at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only messages received before this time"),
+    email: Optional[str] = Query(None, description="Only messages from this sender email"),
+    db: AsyncSession = Depends(get_archive_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get archived messages newest first, one page at a time (admin only)"""
+    reply_count = (
+        select(func.count(archived_message_replies.c.id))
+        .where(archived_message_replies.c.message_id == archived_messages.c.id)
+        .correlate(archived_messages)
+        .scalar_subquery()
+    )
+    query = select(*schema_columns(ArchivedMessageOut, archived_messages.c, reply_count=reply_count))
+    if since is not None:
+        query = query.where(archived_messages.c.timestamp >= since)
+    if until is not None:
+        query = query.where(archived_messages.c.timestamp < until)
+    if email:
+        query = query.where(archived_messages.c.email == email)
+    return await _newest_first_page(db, query, archived_messages, cursor, limit, response)
+
+
+@router.get("/messages/{message_id}/replies", response_model=list[ArchivedMessageReplyOut])
+@query_budget(2)
+async def get_archived_message_replies(
+    message_id: int,
+    db: AsyncSession = Depends(get_archive_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get the replies of an archived message in send order (admin only)"""
+    result = await db.execute(
+        select(*schema_columns(ArchivedMessageReplyOut, archived_message_replies.c))
+        .where(archived_message_replies.c.message_id == message_id)
+        .order_by(archived_message_replies.c.sent_at, archived_message_replies.c.id)
+    )
+    return json_rows(list(result.keys()), result.all())
+
+
+@router.get("/demo-requests", response_model=list[ArchivedDemoRequestOut])
+@query_budget(2)
+async def list_archived_demo_requests(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor returned in the X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[datetime] = Query(None, description="Only requests received at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only requests received before this time"),
+    db: AsyncSession = Depends(get_archive_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get archived demo requests newest first, one page at a time (admin only)"""
+    query = select(*schema_columns(ArchivedDemoRequestOut, archived_demo_requests.c))
+    if since is not None:
+        query = query.where(archived_demo_requests.c.timestamp >= since)
+    if until is not None:
+        query = query.where(archived_demo_requests.c.timestamp < until)
+    return await _newest_first_page(db, query, archived_demo_requests, cursor, limit, response)
+
+
+@router.post("/run", response_model=ArchiveRunResult)
+async def run_archive(
+    days: Optional[int] = Query(None, ge=1, description="Archive rows untouched for this many days (default ARCHIVE_AFTER_DAYS)"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Apply the retention policy now instead of waiting for the next scheduled run (super admin only)"""
+    if not current_user.is_super_admin:
+        raise HTTPException(status_code=403, detail="Only super admins can run the archiver")
+
+    cutoff = retention_cutoff(days)
+    try:
+        moved = await asyncio.to_thread(archive_older_than, cutoff)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"cutoff": cutoff, **moved}
@@ -1,11 +1,11 @@
 """Authentication API Router"""
 import secrets
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import get_db
+from app.config.database import get_async_db, get_read_db
 from app.models import User
 from app.schemas import (
     UserCreate, UserOut, Token, PasswordChange,
@@ -14,19 +14,25 @@ from app.schemas import (
 from app.services.auth import (
     get_current_user, get_current_admin_user,
     authenticate_user, create_user, create_access_token,
-    get_user_by_username, get_user_by_email, verify_password, get_password_hash
+    get_user_by_username, get_user_by_email, verify_password_async, get_password_hash_async
 )
+from app.services.user_cache import user_cache
 from app.config.settings import settings
 from app.middleware import check_rate_limit
+from app.utils import queries
+from app.utils.etag import conditional_get
+from app.utils.fast_json import json_rows
+from app.utils.query_stats import query_budget
 from app.utils.validation import validate_password_strength, validate_username
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
 
 @router.post("/register", response_model=UserOut)
+@query_budget(5)
 async def register(
     user: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Register a new user (admin only)"""
@@ -36,11 +42,11 @@ async def register(
         raise HTTPException(status_code=400, detail=error)
     
     # Check if username already exists
-    if get_user_by_username(db, user.username):
+    if await get_user_by_username(db, user.username):
         raise HTTPException(status_code=400, detail="Username already registered")
     
     # Check if email already exists
-    if get_user_by_email(db, user.email):
+    if await get_user_by_email(db, user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Validate password strength
@@ -49,21 +55,22 @@ async def register(
         raise HTTPException(status_code=400, detail=error)
     
     # New users are admins by default and don't need to change password
-    db_user = create_user(db, user, is_admin=True, must_change_password=False)
+    db_user = await create_user(db, user, is_admin=True, must_change_password=False)
     return db_user
 
 
 @router.post("/login", response_model=Token)
+@query_budget(2)
 async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login with username and password to get JWT token"""
     # Rate limiting: 5 login attempts per 15 minutes per IP
     await check_rate_limit(request, max_requests=5, window_seconds=900)
     
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,7 +80,10 @@ async def login(
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    # last_login does not affect authentication: refresh this worker's entry
+    # only, instead of emptying every worker's cache on each login
+    user_cache.set(user)
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -89,6 +99,7 @@ async def login(
 
 
 @router.get("/me", response_model=UserOut)
+@query_budget(1)
 async def get_me(current_user: User = Depends(get_current_user)):
     """Get current logged-in user information"""
     return current_user
@@ -101,14 +112,15 @@ async def logout():
 
 
 @router.post("/change-password")
+@query_budget(3)
 async def change_password(
     password_data: PasswordChange,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Change user password"""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Verify new passwords match
@@ -121,37 +133,46 @@ async def change_password(
         raise HTTPException(status_code=400, detail=error)
     
     # Get the user from the current database session
-    db_user = db.query(User).filter(User.id == current_user.id).first()
+    db_user = await db.get(User, current_user.id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Update password
-    db_user.hashed_password = get_password_hash(password_data.new_password)
+    db_user.hashed_password = await get_password_hash_async(password_data.new_password)
     db_user.must_change_password = False
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    user_cache.invalidate(db_user.username)
     
     return {"message": "Password changed successfully", "must_change_password": db_user.must_change_password}
 
 
 @router.get("/users", response_model=list[UserOut])
+@query_budget(3)
 async def list_users(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Get all users (admin only)"""
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    return users
+    """Get all users (admin only); 304 when If-None-Match matches the ETag"""
+    not_modified = await conditional_get(db, request, response, User)
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(queries.user_list())
+    return json_rows(list(result.keys()), result.all(), response)
 
 
 @router.patch("/users/{user_id}/toggle-active")
+@query_budget(4)
 async def toggle_user_active(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Toggle user active status (admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -164,8 +185,9 @@ async def toggle_user_active(
         raise HTTPException(status_code=403, detail="Cannot deactivate super admin accounts")
     
     user.is_active = not user.is_active
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.username)
     return {
         "message": f"User {'activated' if user.is_active else 'deactivated'} successfully",
         "user": user
@@ -173,16 +195,17 @@ async def toggle_user_active(
 
 
 @router.post("/forgot-password")
+@query_budget(2)
 async def forgot_password(
     request: Request,
     req: ForgotPasswordRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Request password reset token"""
     # Rate limiting: 3 reset attempts per hour per IP
     await check_rate_limit(request, max_requests=3, window_seconds=3600)
     
-    user = get_user_by_email(db, req.email)
+    user = await get_user_by_email(db, req.email)
     if not user:
         # Don't reveal if email exists or not for security
         return {"message": "If the email exists, a reset link will be sent"}
@@ -191,7 +214,7 @@ async def forgot_password(
     reset_token = secrets.token_urlsafe(32)
     user.reset_token = reset_token
     user.reset_token_expiry = datetime.utcnow() + timedelta(hours=1)
-    db.commit()
+    await db.commit()
     
     # TODO: Send email with reset link using SendGrid
     # For now, return the token (in production, this should be emailed)
@@ -202,12 +225,14 @@ async def forgot_password(
 
 
 @router.post("/reset-password")
+@query_budget(2)
 async def reset_password(
     request: ResetPasswordRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reset password using token"""
-    user = db.query(User).filter(User.reset_token == request.token).first()
+    result = await db.execute(queries.user_by_reset_token(request.token))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
     
@@ -225,10 +250,11 @@ async def reset_password(
         raise HTTPException(status_code=400, detail=error)
     
     # Update password and clear reset token
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await get_password_hash_async(request.new_password)
     user.reset_token = None
     user.reset_token_expiry = None
     user.must_change_password = False
-    db.commit()
+    await db.commit()
+    user_cache.invalidate(user.username)
     
     return {"message": "Password reset successfully"}
@@ -1,79 +1,212 @@
 """Demo Requests API Router"""
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import get_db
+from app.config.database import get_async_db, get_read_db
 from app.models import DemoRequest, User
-from app.schemas import DemoRequestCreate, DemoRequestOut, DemoRequestUpdate
+from app.schemas import (
+    DemoRequestCreate, DemoRequestOut, DemoRequestUpdate, DemoRequestSearchResults,
+    DemoRequestBatchUpdate, BatchResult
+)
 from app.services.auth import get_current_admin_user
-from app.services.email import email_service
+from app.services.events import event_broker, publish_event, publish_events
+from app.services.outbox import enqueue_email, outbox_dispatcher
+from app.services.search import search
+from app.utils import queries
+from app.utils.etag import conditional_get
+from app.utils.fast_json import json_rows
+from app.utils.query_stats import query_budget, set_budget_items
+from app.utils.pagination import MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/demo-requests", tags=["demo-requests"])
 
 
 @router.post("", response_model=DemoRequestOut)
+@query_budget(4)
 async def create_demo_request(
     demo_req: DemoRequestCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new demo request"""
     db_demo_request = DemoRequest(**demo_req.dict())
     db.add(db_demo_request)
-    db.commit()
-    db.refresh(db_demo_request)
+    await db.flush()
     
-    # Send notification email in background
-    background_tasks.add_task(
-        email_service.send_demo_request_notification,
-        platform_name=demo_req.platform_name,
-        full_name=demo_req.full_name,
-        email=demo_req.email,
-        phone=demo_req.phone,
-        company_name=demo_req.company_name,
-        message=demo_req.message
+    # Queue notification email in the same transaction
+    enqueue_email(
+        db,
+        "demo_request_notification",
+        {
+            "platform_name": demo_req.platform_name,
+            "full_name": demo_req.full_name,
+            "email": demo_req.email,
+            "phone": demo_req.phone,
+            "company_name": demo_req.company_name,
+            "message": demo_req.message
+        },
+        demo_request_id=db_demo_request.id
     )
+    publish_event(db, "demo.created", {
+        "id": db_demo_request.id,
+        "platform_name": db_demo_request.platform_name,
+        "full_name": db_demo_request.full_name,
+        "timestamp": db_demo_request.timestamp
+    })
+    await db.commit()
+    await db.refresh(db_demo_request)
+    outbox_dispatcher.wake()
+    event_broker.notify()
     
     return db_demo_request
 
 
 @router.get("", response_model=list[DemoRequestOut])
+@query_budget(3)
 async def get_demo_requests(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all demo requests (admin only)"""
-    demo_requests = db.query(DemoRequest).order_by(DemoRequest.timestamp.desc()).all()
-    return demo_requests
+    """Get all demo requests (admin only); 304 when If-None-Match matches the ETag"""
+    not_modified = await conditional_get(db, request, response, DemoRequest)
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(queries.demo_request_list())
+    return json_rows(list(result.keys()), result.all(), response)
+
+
+@router.get("/search", response_model=DemoRequestSearchResults)
+@query_budget(2)
+async def search_demo_requests(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text search over demo request name, company, message and notes (admin only)"""
+    hits, next_offset = await search(
+        db, "demo_requests_fts",
+        ["id", "platform_name", "full_name", "email", "company_name", "timestamp", "status"],
+        q, limit, offset
+    )
+    return {"query": q, "items": hits, "next_offset": next_offset}
+
+
+@router.post("/batch", response_model=BatchResult)
+@query_budget(2, per_item=2)
+async def batch_update_demo_requests(
+    request: Request,
+    batch: DemoRequestBatchUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Apply several demo request changes in one transaction (admin only)
+    
+    Each operation sets read state, status, schedule and/or notes on all of
+    its ids with a single UPDATE. Operations run in order. Returns a result
+    per id and operation: updated, unchanged (already had those values) or
+    not_found.
+    """
+    # The user lookup and one SELECT, then an UPDATE and an event INSERT per operation
+    set_budget_items(request, len(batch.operations))
+    all_ids = {request_id for op in batch.operations for request_id in op.ids}
+    result = await db.execute(
+        select(
+            DemoRequest.id, DemoRequest.is_read, DemoRequest.status,
+            DemoRequest.demo_scheduled_at, DemoRequest.notes
+        ).where(DemoRequest.id.in_(all_ids))
+    )
+    # Current values, kept up to date as operations are applied
+    current = {row.id: row._asdict() for row in result.all()}
+    
+    now = datetime.utcnow()
+    results = []
+    updated = 0
+    for index, op in enumerate(batch.operations):
+        changes = op.model_dump(exclude={'ids'}, exclude_none=True)
+        changed = [
+            request_id for request_id in op.ids
+            if request_id in current
+            and any(current[request_id][field] != value for field, value in changes.items())
+        ]
+        
+        if changed:
+            values = dict(changes)
+            if 'is_read' in changes:
+                values['read_at'] = now if changes['is_read'] else None
+            await db.execute(
+                update(DemoRequest)
+                .where(DemoRequest.id.in_(changed))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            for request_id in changed:
+                current[request_id].update(changes)
+            await publish_events(db, [
+                ("demo.updated", {"id": request_id, **values}) for request_id in changed
+            ])
+            updated += len(changed)
+        
+        changed_ids = set(changed)
+        results.extend(
+            {
+                "id": request_id,
+                "operation": index,
+                "status": (
+                    "not_found" if request_id not in current
+                    else "updated" if request_id in changed_ids
+                    else "unchanged"
+                )
+            }
+            for request_id in op.ids
+        )
+    
+    if updated:
+        await db.commit()
+        event_broker.notify()
+    return {"updated": updated, "results": results}
 
 
 @router.patch("/{request_id}/mark-read")
+@query_budget(4)
 async def mark_demo_request_read(
     request_id: int,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a demo request as read"""
-    demo_request = db.query(DemoRequest).filter(DemoRequest.id == request_id).first()
+    demo_request = await db.get(DemoRequest, request_id)
     if not demo_request:
         raise HTTPException(status_code=404, detail='Demo request not found')
     
     demo_request.is_read = True
     demo_request.read_at = datetime.utcnow()
-    db.commit()
+    publish_event(db, "demo.updated", {
+        "id": demo_request.id,
+        "is_read": True,
+        "read_at": demo_request.read_at
+    })
+    await db.commit()
+    event_broker.notify()
     return {'status': 'success'}
 
 
 @router.patch("/{request_id}", response_model=DemoRequestOut)
+@query_budget(5)
 async def update_demo_request(
     request_id: int,
     update_data: DemoRequestUpdate,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update demo request status, notes, or schedule"""
-    demo_request = db.query(DemoRequest).filter(DemoRequest.id == request_id).first()
+    demo_request = await db.get(DemoRequest, request_id)
     if not demo_request:
         raise HTTPException(status_code=404, detail='Demo request not found')
     
@@ -85,6 +218,11 @@ async def update_demo_request(
     if update_data.notes is not None:
         demo_request.notes = update_data.notes
     
-    db.commit()
-    db.refresh(demo_request)
+    publish_event(db, "demo.updated", {
+        "id": demo_request.id,
+        **update_data.model_dump(exclude_none=True)
+    })
+    await db.commit()
+    await db.refresh(demo_request)
+    event_broker.notify()
     return demo_request
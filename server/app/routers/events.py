@@ -0,0 +1,86 @@
+"""Admin Event Stream API Router"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import get_async_db
+from app.config.settings import settings
+from app.models import User
+from app.schemas import StreamTicketOut
+from app.services.auth import (
+    STREAM_TICKET_TTL_SECONDS, get_current_admin_user, get_current_stream_admin_user, issue_stream_ticket
+)
+from app.services.events import event_broker, format_sse
+from app.utils.query_stats import query_budget
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+@router.post("/ticket", response_model=StreamTicketOut)
+@query_budget(3)
+async def create_stream_ticket(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Exchange the Authorization header for a single-use ticket to open GET /api/events with (admin only)"""
+    ticket = await issue_stream_ticket(db, current_user)
+    return {"ticket": ticket, "expires_in": STREAM_TICKET_TTL_SECONDS}
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    after: Optional[int] = Query(None, ge=0, description="Resume after this event id (new EventSource instances)"),
+    current_user: User = Depends(get_current_stream_admin_user)
+):
+    """
+    Stream admin events as Server-Sent Events (admin only)
+
+    Event types: message.created, message.read, message.unread, reply.sent,
+    demo.created, demo.updated. Browsers' EventSource cannot send an
+    Authorization header, so it connects with ?ticket= from POST
+    /api/events/ticket. A ticket opens one stream only: when the connection
+    drops, the client fetches a new ticket and opens a new EventSource with
+    ?after=<last event id> to receive the events it missed. Clients that can
+    send headers use Authorization and Last-Event-ID instead.
+    """
+    if last_event_id and last_event_id.isdigit():
+        resume_from = int(last_event_id)
+    else:
+        resume_from = after
+    subscription = await event_broker.subscribe(resume_from)
+
+    async def event_stream():
+        try:
+            # Ask the browser to reconnect after 3s if the connection drops
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+
+                if event is None:
+                    break
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable nginx response buffering
+        }
+    )
@@ -0,0 +1,100 @@
+"""Data Export API Router"""
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.models import DemoRequest, Message, MessageReply, User
+from app.services.auth import get_current_admin_user
+from app.services.export import EXPORT_FORMATS, stream_export
+from app.utils.query_stats import query_budget
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+def _export_response(name: str, statement, export_format: str) -> StreamingResponse:
+    """Stream the statement's rows as a file download"""
+    columns = [column.name for column in statement.selected_columns]
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+    return StreamingResponse(
+        stream_export(statement, columns, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        }
+    )
+
+
+def _date_range(statement, column, since: Optional[datetime], until: Optional[datetime]):
+    if since is not None:
+        statement = statement.where(column >= since)
+    if until is not None:
+        statement = statement.where(column < until)
+    return statement
+
+
+@router.get("/messages")
+@query_budget(2)
+async def export_messages(
+    format: ExportFormat = Query("csv"),
+    since: Optional[datetime] = Query(None, description="Only messages received at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only messages received before this time"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Download contact messages, oldest first, as CSV or NDJSON (admin only)"""
+    statement = select(
+        Message.id, Message.timestamp, Message.name, Message.email, Message.subject,
+        Message.message, Message.is_read, Message.read_at, Message.delivered
+    )
+    statement = _date_range(statement, Message.timestamp, since, until)
+    return _export_response(
+        "messages", statement.order_by(Message.timestamp, Message.id), format
+    )
+
+
+@router.get("/replies")
+@query_budget(2)
+async def export_replies(
+    format: ExportFormat = Query("csv"),
+    since: Optional[datetime] = Query(None, description="Only replies sent at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only replies sent before this time"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Download admin replies with their message's sender, as CSV or NDJSON (admin only)"""
+    statement = (
+        select(
+            MessageReply.id, MessageReply.sent_at, MessageReply.message_id,
+            Message.email.label("recipient_email"), User.username.label("admin_username"),
+            MessageReply.reply_from_email, MessageReply.reply_subject, MessageReply.reply_body,
+            MessageReply.delivered
+        )
+        .join(Message, Message.id == MessageReply.message_id)
+        .outerjoin(User, User.id == MessageReply.admin_id)
+    )
+    statement = _date_range(statement, MessageReply.sent_at, since, until)
+    return _export_response("replies", statement.order_by(MessageReply.id), format)
+
+
+@router.get("/demo-requests")
+@query_budget(2)
+async def export_demo_requests(
+    format: ExportFormat = Query("csv"),
+    since: Optional[datetime] = Query(None, description="Only requests received at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only requests received before this time"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Download demo requests, oldest first, as CSV or NDJSON (admin only)"""
+    statement = select(
+        DemoRequest.id, DemoRequest.timestamp, DemoRequest.platform_id, DemoRequest.platform_name,
+        DemoRequest.platform_category, DemoRequest.full_name, DemoRequest.email, DemoRequest.phone,
+        DemoRequest.company_name, DemoRequest.message, DemoRequest.status,
+        DemoRequest.demo_scheduled_at, DemoRequest.notes, DemoRequest.is_read, DemoRequest.read_at
+    )
+    statement = _date_range(statement, DemoRequest.timestamp, since, until)
+    return _export_response(
+        "demo-requests", statement.order_by(DemoRequest.timestamp, DemoRequest.id), format
+    )
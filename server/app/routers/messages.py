@@ -1,22 +1,36 @@
 """Messages API Router"""
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import get_db
+from app.config.database import get_async_db, get_read_db
 from app.models import Message, MessageReply, User
-from app.schemas import MessageCreate, MessageOut, MessageReplyCreate, MessageReplyWithAdmin
+from app.schemas import (
+    MessageCreate, MessageOut, MessageReplyCreate, MessageReplyWithAdmin, MessageSearchResults,
+    MessageSummary, MessageBatchUpdate, BatchResult
+)
 from app.services.auth import get_current_admin_user
-from app.services.email import email_service
+from app.services.events import event_broker, publish_event, publish_events
+from app.services.outbox import enqueue_email, outbox_dispatcher
+from app.services.search import search
+from app.utils import queries
+from app.utils.etag import conditional_get
+from app.utils.fast_json import json_rows
+from app.utils.query_stats import query_budget
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+)
 
 router = APIRouter(prefix="/api/messages", tags=["messages"])
 
 
 @router.post("", response_model=MessageOut)
+@query_budget(4)
 async def create_message(
     msg: MessageCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new contact message"""
     db_msg = Message(
@@ -26,57 +40,194 @@ async def create_message(
         message=msg.message
     )
     db.add(db_msg)
-    db.commit()
-    db.refresh(db_msg)
-    
-    # Send notification email in background
-    background_tasks.add_task(
-        email_service.send_contact_notification,
-        msg.name,
-        msg.email,
-        msg.subject,
-        msg.message
+    await db.flush()
+    
+    # Queue notification email in the same transaction
+    enqueue_email(
+        db,
+        "contact_notification",
+        {
+            "name": msg.name,
+            "email": msg.email,
+            "subject": msg.subject,
+            "message": msg.message
+        },
+        message_id=db_msg.id
     )
+    publish_event(db, "message.created", {
+        "id": db_msg.id,
+        "name": db_msg.name,
+        "email": db_msg.email,
+        "subject": db_msg.subject,
+        "timestamp": db_msg.timestamp
+    })
+    await db.commit()
+    await db.refresh(db_msg)
+    outbox_dispatcher.wake()
+    event_broker.notify()
     
     return db_msg
 
 
 @router.get("", response_model=list[MessageOut])
+@query_budget(3)
 async def list_messages(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor returned in the X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    is_read: Optional[bool] = None,
+    since: Optional[datetime] = Query(None, description="Only messages received at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only messages received before this time"),
+    email: Optional[str] = Query(None, description="Only messages from this sender email"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Get all messages (admin only)"""
-    msgs = db.query(Message).order_by(Message.timestamp.desc()).all()
-    
-    # Add reply count to each message
-    result = []
-    for msg in msgs:
-        msg_dict = {
-            "id": msg.id,
-            "name": msg.name,
-            "email": msg.email,
-            "subject": msg.subject,
-            "message": msg.message,
-            "timestamp": msg.timestamp,
-            "delivered": msg.delivered,
-            "is_read": msg.is_read,
-            "read_at": msg.read_at,
-            "reply_count": len(msg.replies)
-        }
-        result.append(msg_dict)
+    """
+    Get messages newest first, one page at a time (admin only)
+    
+    Pages are ordered by (timestamp, id) descending. When more messages are
+    available, the cursor for the next page is returned in the X-Next-Cursor
+    response header. Responds 304 when If-None-Match matches the ETag.
+    """
+    not_modified = await conditional_get(db, request, response, Message, MessageReply)
+    if not_modified:
+        return not_modified
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(queries.message_page(
+        limit + 1, after=after, is_read=is_read, since=since, until=until, email=email
+    ))
+    keys = list(result.keys())
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    if has_more:
+        last_msg = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_msg.timestamp, last_msg.id)
+    
+    # Column tuples go straight to JSON, without a MessageOut per row
+    return json_rows(keys, rows, response)
+
+
+@router.get("/search", response_model=MessageSearchResults)
+@query_budget(2)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Full-text search over message name, email, subject and body (admin only)"""
+    hits, next_offset = await search(
+        db, "messages_fts",
+        ["id", "name", "email", "subject", "timestamp", "is_read"],
+        q, limit, offset
+    )
+    return {"query": q, "items": hits, "next_offset": next_offset}
+
+
+@router.get("/summary", response_model=MessageSummary)
+@query_budget(3)
+async def get_message_summary(
+    request: Request,
+    response: Response,
+    today_start: datetime = Query(..., description="Start of the admin's local day, as a UTC time"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Dashboard counts in one aggregate query instead of downloading every message (admin only)
     
-    return result
+    today_start is part of the query string and therefore of the ETag, so
+    the "today" count is recomputed when the admin's day changes. Responds
+    304 when If-None-Match matches the ETag.
+    """
+    not_modified = await conditional_get(db, request, response, Message, MessageReply)
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(queries.message_summary(today_start))
+    return result.one()._asdict()
+
+
+@router.post("/batch", response_model=BatchResult, response_model_exclude_none=True)
+@query_budget(5)
+async def batch_update_messages(
+    batch: MessageBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Mark many messages read or unread in one transaction (admin only)
+    
+    Returns a result per id: updated, unchanged (already in that state)
+    or not_found.
+    """
+    result = await db.execute(
+        select(Message.id, Message.is_read).where(Message.id.in_(batch.ids))
+    )
+    current = {message_id: bool(is_read) for message_id, is_read in result.all()}
+    changed = [
+        message_id for message_id in batch.ids
+        if message_id in current and current[message_id] != batch.is_read
+    ]
+    
+    if changed:
+        now = datetime.utcnow()
+        await db.execute(
+            update(Message)
+            .where(Message.id.in_(changed))
+            .values(
+                is_read=batch.is_read,
+                read_by_admin_id=current_user.id if batch.is_read else None,
+                read_at=now if batch.is_read else None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if batch.is_read:
+            await publish_events(db, [
+                ("message.read", {"id": message_id, "read_by": current_user.username, "read_at": now})
+                for message_id in changed
+            ])
+        else:
+            await publish_events(db, [("message.unread", {"id": message_id}) for message_id in changed])
+        await db.commit()
+        event_broker.notify()
+    
+    changed_ids = set(changed)
+    results = [
+        {
+            "id": message_id,
+            "status": (
+                "not_found" if message_id not in current
+                else "updated" if message_id in changed_ids
+                else "unchanged"
+            )
+        }
+        for message_id in batch.ids
+    ]
+    return {"updated": len(changed), "results": results}
 
 
 @router.patch("/{message_id}/mark-read")
+@query_budget(4)
 async def mark_message_read(
     message_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Mark a message as read"""
-    message = db.query(Message).filter(Message.id == message_id).first()
+    message = await db.get(Message, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
@@ -84,22 +235,28 @@ async def mark_message_read(
         message.is_read = True
         message.read_by_admin_id = current_user.id
         message.read_at = datetime.utcnow()
-        db.commit()
+        publish_event(db, "message.read", {
+            "id": message.id,
+            "read_by": current_user.username,
+            "read_at": message.read_at
+        })
+        await db.commit()
+        event_broker.notify()
     
     return {"message": "Message marked as read"}
 
 
 @router.post("/{message_id}/reply", response_model=MessageReplyWithAdmin)
+@query_budget(6)
 async def send_message_reply(
     message_id: int,
     reply_data: MessageReplyCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Reply to a contact message (admin only)"""
     # Verify message exists
-    message = db.query(Message).filter(Message.id == message_id).first()
+    message = await db.get(Message, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
@@ -112,25 +269,45 @@ async def send_message_reply(
         reply_body=reply_data.reply_body
     )
     db.add(reply)
-    db.commit()
-    db.refresh(reply)
-    
-    # Send email in background
-    background_tasks.add_task(
-        email_service.send_reply_email,
-        to_email=message.email,
-        to_name=message.name,
-        from_email=reply_data.reply_from_email,
-        subject=reply_data.reply_subject,
-        body=reply_data.reply_body
-    )
     
     # Mark message as read if not already
+    events = []
     if not message.is_read:
         message.is_read = True
         message.read_by_admin_id = current_user.id
         message.read_at = datetime.utcnow()
-        db.commit()
+        events.append(("message.read", {
+            "id": message.id,
+            "read_by": current_user.username,
+            "read_at": message.read_at
+        }))
+    
+    await db.flush()
+    
+    # Queue the email in the same transaction as the reply
+    enqueue_email(
+        db,
+        "reply",
+        {
+            "to_email": message.email,
+            "to_name": message.name,
+            "from_email": reply_data.reply_from_email,
+            "subject": reply_data.reply_subject,
+            "body": reply_data.reply_body
+        },
+        reply_id=reply.id
+    )
+    events.append(("reply.sent", {
+        "id": reply.id,
+        "message_id": message_id,
+        "admin_username": current_user.username,
+        "reply_subject": reply.reply_subject,
+        "sent_at": reply.sent_at
+    }))
+    await publish_events(db, events)
+    await db.commit()
+    outbox_dispatcher.wake()
+    event_broker.notify()
     
     # Return reply with admin username
     return MessageReplyWithAdmin(
@@ -146,29 +323,26 @@ async def send_message_reply(
 
 
 @router.get("/{message_id}/replies", response_model=list[MessageReplyWithAdmin])
+@query_budget(2)
 async def get_message_replies(
     message_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Get all replies for a message (admin only)"""
-    replies = db.query(MessageReply).filter(
-        MessageReply.message_id == message_id
-    ).all()
-    
-    # Add admin usernames
-    result = []
-    for reply in replies:
-        admin = db.query(User).filter(User.id == reply.admin_id).first()
-        result.append(MessageReplyWithAdmin(
+    """Get all replies for a message in send order, with admin usernames (admin only)"""
+    # One round trip: join the replying admin instead of loading it per reply
+    result = await db.execute(queries.message_replies(message_id))
+    
+    return [
+        MessageReplyWithAdmin(
             id=reply.id,
             message_id=reply.message_id,
             admin_id=reply.admin_id,
-            admin_username=admin.username if admin else "Unknown",
+            admin_username=admin_username or "Unknown",
             reply_from_email=reply.reply_from_email,
             reply_subject=reply.reply_subject,
             reply_body=reply.reply_body,
             sent_at=reply.sent_at
-        ))
-    
-    return result
+        )
+        for reply, admin_username in result.all()
+    ]
@@ -0,0 +1,30 @@
+"""Prometheus Metrics Router"""
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app.config.settings import settings
+from app.services.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus scrape endpoint, aggregated across all workers
+
+    Scrapers must send METRICS_TOKEN as a bearer token. Production refuses
+    to start without one; only DEBUG may leave it empty.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not authorization or not secrets.compare_digest(authorization, expected):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
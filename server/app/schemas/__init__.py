@@ -1,11 +1,25 @@
 """Pydantic Schemas"""
-from .message import MessageCreate, MessageOut, MessageReplyCreate, MessageReplyOut, MessageReplyWithAdmin
-from .user import UserCreate, UserLogin, UserOut, Token, TokenData, PasswordChange, ForgotPasswordRequest, ResetPasswordRequest
-from .demo import DemoRequestCreate, DemoRequestOut, DemoRequestUpdate
+from .message import (
+    MessageCreate, MessageOut, MessageReplyCreate, MessageReplyOut, MessageReplyWithAdmin,
+    MessageSearchHit, MessageSearchResults, MessageSummary, MessageBatchUpdate
+)
+from .user import UserCreate, UserLogin, UserOut, Token, StreamTicketOut, TokenData, PasswordChange, ForgotPasswordRequest, ResetPasswordRequest
+from .demo import (
+    DemoRequestCreate, DemoRequestOut, DemoRequestUpdate,
+    DemoRequestSearchHit, DemoRequestSearchResults,
+    DemoRequestBatchOperation, DemoRequestBatchUpdate
+)
+from .batch import BatchItemResult, BatchResult
+from .archive import ArchivedMessageOut, ArchivedMessageReplyOut, ArchivedDemoRequestOut, ArchiveRunResult
 
 __all__ = [
     "MessageCreate", "MessageOut", "MessageReplyCreate", "MessageReplyOut", "MessageReplyWithAdmin",
-    "UserCreate", "UserLogin", "UserOut", "Token", "TokenData", "PasswordChange", 
+    "MessageSearchHit", "MessageSearchResults", "MessageSummary", "MessageBatchUpdate",
+    "UserCreate", "UserLogin", "UserOut", "Token", "StreamTicketOut", "TokenData", "PasswordChange", 
     "ForgotPasswordRequest", "ResetPasswordRequest",
-    "DemoRequestCreate", "DemoRequestOut", "DemoRequestUpdate"
+    "DemoRequestCreate", "DemoRequestOut", "DemoRequestUpdate",
+    "DemoRequestSearchHit", "DemoRequestSearchResults",
+    "DemoRequestBatchOperation", "DemoRequestBatchUpdate",
+    "BatchItemResult", "BatchResult",
+    "ArchivedMessageOut", "ArchivedMessageReplyOut", "ArchivedDemoRequestOut", "ArchiveRunResult"
 ]
@@ -0,0 +1,30 @@
+"""Archive Pydantic Schemas"""
+from pydantic import BaseModel
+import datetime
+
+from .demo import DemoRequestOut
+from .message import MessageOut, MessageReplyOut
+
+
+class ArchivedMessageOut(MessageOut):
+    """Message moved to the archive database"""
+    archived_at: datetime.datetime
+
+
+class ArchivedMessageReplyOut(MessageReplyOut):
+    """Reply moved to the archive database with its message"""
+    archived_at: datetime.datetime
+
+
+class ArchivedDemoRequestOut(DemoRequestOut):
+    """Demo request moved to the archive database"""
+    archived_at: datetime.datetime
+
+
+class ArchiveRunResult(BaseModel):
+    """Rows moved by one archive run"""
+    cutoff: datetime.datetime
+    messages: int
+    message_replies: int
+    demo_requests: int
+    skipped: int
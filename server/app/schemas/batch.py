@@ -0,0 +1,29 @@
+"""Batch Operation Pydantic Schemas"""
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+# Most ids one batch request may touch
+MAX_BATCH_SIZE = 500
+
+
+def validate_batch_ids(ids: list[int]) -> list[int]:
+    """Drop duplicate ids (keeping order) and enforce the batch size limit"""
+    if not ids:
+        raise ValueError('At least one id is required')
+    unique_ids = list(dict.fromkeys(ids))
+    if len(unique_ids) > MAX_BATCH_SIZE:
+        raise ValueError(f'A batch cannot contain more than {MAX_BATCH_SIZE} ids')
+    return unique_ids
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a batch operation for one id"""
+    id: int
+    status: Literal["updated", "unchanged", "not_found"]
+    operation: Optional[int] = None  # Index of the operation in the request (multi-operation batches)
+
+
+class BatchResult(BaseModel):
+    """Per-item outcome of a batch request"""
+    updated: int
+    results: list[BatchItemResult]
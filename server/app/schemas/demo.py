@@ -1,8 +1,10 @@
 """Demo Request Pydantic Schemas"""
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
 from typing import Optional
 import datetime
 
+from .batch import MAX_BATCH_SIZE, validate_batch_ids
+
 
 class DemoRequestCreate(BaseModel):
     """Schema for creating a demo request"""
@@ -43,3 +45,57 @@ class DemoRequestUpdate(BaseModel):
     status: Optional[str] = None
     demo_scheduled_at: Optional[datetime.datetime] = None
     notes: Optional[str] = None
+
+
+class DemoRequestSearchHit(BaseModel):
+    """Demo request matching a full-text search"""
+    id: int
+    platform_name: str
+    full_name: str
+    email: EmailStr
+    company_name: Optional[str]
+    timestamp: datetime.datetime
+    status: str
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+    rank: float
+
+
+class DemoRequestSearchResults(BaseModel):
+    """One page of demo request search results, best matches first"""
+    query: str
+    items: list[DemoRequestSearchHit]
+    next_offset: Optional[int] = None
+
+
+class DemoRequestBatchOperation(BaseModel):
+    """One change applied to every listed demo request"""
+    ids: list[int]
+    is_read: Optional[bool] = None
+    status: Optional[str] = None
+    demo_scheduled_at: Optional[datetime.datetime] = None
+    notes: Optional[str] = None
+
+    @field_validator('ids')
+    @classmethod
+    def validate_ids(cls, v):
+        return validate_batch_ids(v)
+
+    @model_validator(mode='after')
+    def validate_changes(self):
+        if all(value is None for value in self.model_dump(exclude={'ids'}).values()):
+            raise ValueError('Operation must change at least one field')
+        return self
+
+
+class DemoRequestBatchUpdate(BaseModel):
+    """Several demo request changes applied in one transaction"""
+    operations: list[DemoRequestBatchOperation]
+
+    @field_validator('operations')
+    @classmethod
+    def validate_operations(cls, v):
+        if not v:
+            raise ValueError('At least one operation is required')
+        if sum(len(op.ids) for op in v) > MAX_BATCH_SIZE:
+            raise ValueError(f'A batch cannot touch more than {MAX_BATCH_SIZE} ids')
+        return v
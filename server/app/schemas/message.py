@@ -3,6 +3,8 @@ from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 import datetime
 
+from .batch import validate_batch_ids
+
 
 class MessageCreate(BaseModel):
     """Schema for creating a new message"""
@@ -86,3 +88,41 @@ class MessageReplyWithAdmin(BaseModel):
     reply_subject: str
     reply_body: str
     sent_at: datetime.datetime
+
+
+class MessageSearchHit(BaseModel):
+    """Message matching a full-text search"""
+    id: int
+    name: str
+    email: EmailStr
+    subject: Optional[str]
+    timestamp: datetime.datetime
+    is_read: bool
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+    rank: float
+
+
+class MessageSearchResults(BaseModel):
+    """One page of message search results, best matches first"""
+    query: str
+    items: list[MessageSearchHit]
+    next_offset: Optional[int] = None
+
+
+class MessageSummary(BaseModel):
+    """Message counts for the admin dashboard, computed in the database"""
+    total: int
+    unread: int
+    replied: int  # messages with at least one reply
+    today: int  # messages received at or after today_start
+
+
+class MessageBatchUpdate(BaseModel):
+    """Mark many messages read or unread at once"""
+    ids: list[int]
+    is_read: bool
+
+    @field_validator('ids')
+    @classmethod
+    def validate_ids(cls, v):
+        return validate_batch_ids(v)
@@ -48,6 +48,12 @@ class Token(BaseModel):
     must_change_password: bool = False
 
 
+class StreamTicketOut(BaseModel):
+    """Single-use ticket for opening an admin event stream"""
+    ticket: str
+    expires_in: int  # seconds
+
+
 class TokenData(BaseModel):
     """Schema for token data"""
     username: Optional[str] = None
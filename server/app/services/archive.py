@@ -0,0 +1,327 @@
+"""Retention and Archival Service
+
+Messages (with their replies) and demo requests that nobody has touched for
+ARCHIVE_AFTER_DAYS are moved from the main database to the archive
+database, so the tables every admin request reads stay small. The archiver
+ATTACHes the archive file to one main-database connection and moves rows in
+batches of ARCHIVE_BATCH_SIZE, one short transaction per batch:
+
+    INSERT OR IGNORE INTO archive.<table> SELECT ... FROM main.<table>
+    DELETE FROM main.<table> WHERE <an identical copy is in the archive>
+
+Each batch holds the write lock only briefly, so requests keep being served
+while a large backlog drains. SQLite does not make a transaction spanning two
+WAL databases atomic across both files; because the copy is INSERT OR IGNORE
+and rows keep their ids, a batch interrupted between the two files is simply
+repeated by the next run.
+
+A row is only deleted from the main database once an identical copy is in
+the archive. The hot tables use AUTOINCREMENT, and each run first moves
+their id sequences past the highest archived id, so new rows never reuse an
+archived id. Rows that still collide with a different archived row, left
+over from before that, stay in the main database and are reported as
+skipped.
+
+Every worker runs an ArchiveScheduler; runs from several workers just
+serialize on the database write lock and find nothing left to move.
+
+Usage (e.g. from cron, with --vacuum to give the freed pages back to the OS):
+    python -m app.services.archive [--days 365] [--batch-size 500] [--vacuum]
+"""
+import argparse
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import Select, Table, and_, delete, exists, func, insert, literal, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.types import DateTime
+
+from app.config.database import ARCHIVE_DB_PATH, engine, init_archive_db, init_db
+from app.config.settings import settings
+from app.models import DemoRequest, Message, MessageReply
+from app.models.archive import archived_demo_requests, archived_message_replies, archived_messages
+
+# Longest random delay before a worker's first run, so workers started
+# together do not all archive at once
+FIRST_RUN_JITTER_SECONDS = 600
+
+
+# Hot tables and their archive copies
+ARCHIVED_TABLES = (
+    (Message.__table__, archived_messages),
+    (MessageReply.__table__, archived_message_replies),
+    (DemoRequest.__table__, archived_demo_requests),
+)
+
+
+def _reserve_archived_ids(conn: Connection) -> None:
+    """Move each hot table's AUTOINCREMENT sequence past the highest id in its archive"""
+    for source, target in ARCHIVED_TABLES:
+        archived_max = conn.execute(select(func.max(target.c.id))).scalar()
+        if archived_max is None:
+            continue
+        params = {"name": source.name, "seq": archived_max}
+        updated = conn.execute(text(
+            "UPDATE main.sqlite_sequence SET seq = :seq WHERE name = :name AND seq < :seq"
+        ), params)
+        if updated.rowcount == 0:
+            conn.execute(text(
+                "INSERT INTO main.sqlite_sequence (name, seq) SELECT :name, :seq "
+                "WHERE NOT EXISTS (SELECT 1 FROM main.sqlite_sequence WHERE name = :name)"
+            ), params)
+
+
+def _archived_copy(source: Table, target: Table, identical: bool):
+    """Condition on source rows: the archive holds a row with the same id that is (or is not) identical"""
+    same_content = and_(*(target.c[column.name].is_not_distinct_from(column) for column in source.columns))
+    return exists().where(target.c.id == source.c.id, same_content if identical else ~same_content)
+
+
+def _copy(conn: Connection, source: Table, target: Table, condition, now: datetime) -> None:
+    """Copy matching rows into their archive table, skipping ids already archived"""
+    conn.execute(
+        insert(target).prefix_with("OR IGNORE").from_select(
+            [column.name for column in source.columns] + ["archived_at"],
+            select(*source.columns, literal(now, DateTime)).where(condition)
+        )
+    )
+
+
+def _skip(conflicts: set, label: str, skipped: set, moved: dict) -> None:
+    """Keep rows whose id is taken by a different archived row in the main database"""
+    if not conflicts:
+        return
+    print(f"⚠️  Not archiving {label} {sorted(conflicts)}: their ids belong to different archived rows")
+    skipped.update(conflicts)
+    moved["skipped"] += len(conflicts)
+
+
+def messages_due_for_archiving(cutoff: datetime, batch_size: int, skipped: Iterable[int] = ()) -> Select:
+    """Ids of the oldest messages with no activity since cutoff, excluding skipped"""
+    recent_reply = exists().where(
+        MessageReply.message_id == Message.id,
+        MessageReply.sent_at >= cutoff
+    )
+    return (
+        select(Message.id)
+        .where(
+            Message.timestamp < cutoff,
+            or_(Message.updated_at.is_(None), Message.updated_at < cutoff),
+            ~recent_reply,
+            Message.id.not_in(skipped)
+        )
+        .order_by(Message.timestamp, Message.id)
+        .limit(batch_size)
+    )
+
+
+def demo_requests_due_for_archiving(cutoff: datetime, batch_size: int, skipped: Iterable[int] = ()) -> Select:
+    """Ids of the oldest demo requests with no activity since cutoff, excluding skipped"""
+    return (
+        select(DemoRequest.id)
+        .where(
+            DemoRequest.timestamp < cutoff,
+            or_(DemoRequest.updated_at.is_(None), DemoRequest.updated_at < cutoff),
+            # Keep requests whose demo is still ahead
+            or_(DemoRequest.demo_scheduled_at.is_(None), DemoRequest.demo_scheduled_at < cutoff),
+            DemoRequest.id.not_in(skipped)
+        )
+        .order_by(DemoRequest.timestamp, DemoRequest.id)
+        .limit(batch_size)
+    )
+
+
+def _archive_message_batch(conn: Connection, cutoff: datetime, batch_size: int, moved: dict, skipped: set) -> int:
+    """Move one batch of old messages and all their replies; returns messages selected"""
+    ids = conn.execute(messages_due_for_archiving(cutoff, batch_size, skipped)).scalars().all()
+    if not ids:
+        return 0
+
+    # A message moves together with all its replies or not at all
+    conflicts = set(conn.execute(
+        select(Message.id).where(Message.id.in_(ids), _archived_copy(Message.__table__, archived_messages, False))
+    ).scalars())
+    conflicts.update(conn.execute(
+        select(MessageReply.message_id).where(
+            MessageReply.message_id.in_(ids),
+            _archived_copy(MessageReply.__table__, archived_message_replies, False)
+        )
+    ).scalars())
+    _skip(conflicts, "messages", skipped, moved)
+    move_ids = [message_id for message_id in ids if message_id not in conflicts]
+
+    now = datetime.utcnow()
+    _copy(conn, Message.__table__, archived_messages, Message.id.in_(move_ids), now)
+    _copy(conn, MessageReply.__table__, archived_message_replies, MessageReply.message_id.in_(move_ids), now)
+    replies = conn.execute(delete(MessageReply).where(
+        MessageReply.message_id.in_(move_ids),
+        _archived_copy(MessageReply.__table__, archived_message_replies, True)
+    ))
+    messages = conn.execute(delete(Message).where(
+        Message.id.in_(move_ids),
+        _archived_copy(Message.__table__, archived_messages, True)
+    ))
+    moved["messages"] += messages.rowcount
+    moved["message_replies"] += replies.rowcount
+    return len(ids)
+
+
+def _archive_demo_request_batch(conn: Connection, cutoff: datetime, batch_size: int, moved: dict, skipped: set) -> int:
+    """Move one batch of old demo requests; returns demo requests selected"""
+    ids = conn.execute(demo_requests_due_for_archiving(cutoff, batch_size, skipped)).scalars().all()
+    if not ids:
+        return 0
+
+    conflicts = set(conn.execute(
+        select(DemoRequest.id).where(
+            DemoRequest.id.in_(ids), _archived_copy(DemoRequest.__table__, archived_demo_requests, False)
+        )
+    ).scalars())
+    _skip(conflicts, "demo requests", skipped, moved)
+    move_ids = [demo_id for demo_id in ids if demo_id not in conflicts]
+
+    _copy(conn, DemoRequest.__table__, archived_demo_requests, DemoRequest.id.in_(move_ids), datetime.utcnow())
+    demo_requests = conn.execute(delete(DemoRequest).where(
+        DemoRequest.id.in_(move_ids),
+        _archived_copy(DemoRequest.__table__, archived_demo_requests, True)
+    ))
+    moved["demo_requests"] += demo_requests.rowcount
+    return len(ids)
+
+
+def archive_older_than(cutoff: datetime, batch_size: Optional[int] = None) -> dict:
+    """
+    Move everything not touched since cutoff to the archive database
+
+    Args:
+        cutoff: Rows created and last updated before this are archived
+        batch_size: Rows per transaction (defaults to ARCHIVE_BATCH_SIZE)
+
+    Returns:
+        Number of messages, replies and demo requests moved, and rows skipped because of id conflicts
+    """
+    if ARCHIVE_DB_PATH is None:
+        raise RuntimeError("The archive requires a file-based SQLite database")
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    init_archive_db()
+
+    moved = {"messages": 0, "message_replies": 0, "demo_requests": 0, "skipped": 0}
+    # Qualify the hot tables as main.<table>: unqualified names would fall
+    # through to the archive's tables of the same name if they were missing
+    with engine.connect().execution_options(schema_translate_map={None: "main"}) as conn:
+        # ATTACH is not allowed inside a transaction
+        conn.exec_driver_sql("ATTACH DATABASE ? AS archive", (ARCHIVE_DB_PATH,))
+        conn.commit()
+        try:
+            with conn.begin():
+                _reserve_archived_ids(conn)
+            for archive_batch in (_archive_message_batch, _archive_demo_request_batch):
+                # Rows kept back because of an id conflict are not selected again
+                skipped = set()
+                # One bounded transaction per batch; a short batch means nothing is left
+                while True:
+                    with conn.begin():
+                        count = archive_batch(conn, cutoff, batch_size, moved, skipped)
+                    if count < batch_size:
+                        break
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql("DETACH DATABASE archive")
+            conn.commit()
+    return moved
+
+
+def retention_cutoff(days: Optional[int] = None) -> datetime:
+    """Oldest last-activity time that is kept in the main database"""
+    return datetime.utcnow() - timedelta(days=days if days is not None else settings.ARCHIVE_AFTER_DAYS)
+
+
+class ArchiveScheduler:
+    """Background task that applies the retention policy every ARCHIVE_INTERVAL_HOURS"""
+
+    def __init__(self, after_days: int, interval_hours: float):
+        self.after_days = after_days
+        self.interval_hours = interval_hours
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the archive loop in the running event loop"""
+        if self.after_days <= 0 or self.interval_hours <= 0:
+            return
+        if ARCHIVE_DB_PATH is None:
+            print("⚠️  Archiving disabled: it requires a file-based SQLite database.")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the archive loop; an interrupted batch is repeated by the next run"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        await asyncio.sleep(random.uniform(0, FIRST_RUN_JITTER_SECONDS))
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Archive run error: {e}")
+            await asyncio.sleep(self.interval_hours * 3600)
+
+    async def run_once(self) -> dict:
+        """Archive everything past the retention period without blocking the event loop"""
+        moved = await asyncio.to_thread(archive_older_than, retention_cutoff(self.after_days))
+        if any(moved.values()):
+            print(
+                f"🗄️  Archived {moved['messages']} messages, {moved['message_replies']} replies "
+                f"and {moved['demo_requests']} demo requests"
+            )
+        return moved
+
+
+# Global archive scheduler instance
+archive_scheduler = ArchiveScheduler(
+    after_days=settings.ARCHIVE_AFTER_DAYS,
+    interval_hours=settings.ARCHIVE_INTERVAL_HOURS
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Move old messages and demo requests to the archive database")
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                        help="Archive rows untouched for this many days")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                        help="Rows moved per transaction")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="VACUUM the main database afterwards to shrink the file")
+    args = parser.parse_args()
+
+    if ARCHIVE_DB_PATH is None:
+        print("❌ The archive requires a file-based SQLite database")
+        return 1
+
+    init_db()
+    moved = archive_older_than(retention_cutoff(args.days), args.batch_size)
+    print(
+        f"✅ Archived {moved['messages']} messages, {moved['message_replies']} replies "
+        f"and {moved['demo_requests']} demo requests to {ARCHIVE_DB_PATH}"
+    )
+    if args.vacuum:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+        print("✅ Main database vacuumed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,37 @@
 """Authentication Service"""
+import hashlib
 import os
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-import bcrypt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import get_db
+from app.config.database import AsyncSessionLocal, get_async_db
 from app.config.settings import settings
-from app.models import User
+from app.models import StreamTicket, User
 from app.schemas import UserCreate
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+# Seconds a stream ticket stays redeemable; it only has to outlive the
+# round trip between fetching it and opening the EventSource
+STREAM_TICKET_TTL_SECONDS = 30
+
+# bcrypt and python-jose (with the cryptography backend it loads) are
+# imported on first use, so health probes, CLI tools and workers that never
+# see a login do not pay for them at startup
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
+    import bcrypt
     return bcrypt.checkpw(
         plain_password.encode('utf-8'), 
         hashed_password.encode('utf-8')
@@ -27,6 +40,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt"""
+    import bcrypt
     # Bcrypt has a 72-byte limit
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
@@ -38,8 +52,19 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool without blocking the event loop"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the hashing pool without blocking the event loop"""
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -52,6 +77,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_access_token(token: str) -> Optional[str]:
     """Decode a JWT token and return the username"""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
@@ -62,36 +88,38 @@ def decode_access_token(token: str) -> Optional[str]:
         return None
 
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     """Get a user from the database by username"""
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get a user from the database by email"""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
     """Authenticate a user by username and password"""
-    user = get_user_by_username(db, username)
+    user = await get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     if not user.is_active:
         return None
     return user
 
 
-def create_user(
-    db: Session, 
+async def create_user(
+    db: AsyncSession, 
     user: UserCreate, 
     is_admin: bool = False, 
     must_change_password: bool = False
 ) -> User:
     """Create a new user in the database"""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -101,29 +129,29 @@ def create_user(
         must_change_password=must_change_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user from JWT token"""
+async def get_user_from_token(db: AsyncSession, token: Optional[str]) -> User:
+    """Resolve the active user a JWT token belongs to"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    username = decode_access_token(token)
+    username = decode_access_token(token) if token else None
     if username is None:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=username)
+    user = user_cache.get(username)
     if user is None:
-        raise credentials_exception
+        user = await get_user_by_username(db, username=username)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(user)
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -131,6 +159,14 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get the current authenticated user from JWT token"""
+    return await get_user_from_token(db, token)
+
+
 async def get_current_admin_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -141,3 +177,72 @@ async def get_current_admin_user(
             detail="Not enough permissions"
         )
     return current_user
+
+
+def _hash_ticket(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode("utf-8")).hexdigest()
+
+
+async def issue_stream_ticket(db: AsyncSession, user: User) -> str:
+    """
+    Create a single-use ticket that opens one event stream as user
+
+    Args:
+        db: Database session
+        user: Authenticated admin the stream will belong to
+
+    Returns:
+        The ticket; only its hash is stored
+    """
+    ticket = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    # Tickets that were never redeemed are cleared as new ones are issued
+    await db.execute(delete(StreamTicket).where(StreamTicket.expires_at <= now))
+    db.add(StreamTicket(
+        ticket_hash=_hash_ticket(ticket),
+        user_id=user.id,
+        expires_at=now + timedelta(seconds=STREAM_TICKET_TTL_SECONDS)
+    ))
+    await db.commit()
+    return ticket
+
+
+async def get_current_stream_admin_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(None, description="Single-use ticket from POST /api/events/ticket (EventSource)")
+) -> User:
+    """
+    Require an admin, from the Authorization header or a single-use stream ticket
+
+    JWTs are never accepted in the query string, where access logs and
+    browser history would keep them. Redeeming a ticket deletes it in the
+    same statement, so it works once, on any worker.
+
+    The lookup uses its own short-lived session instead of get_async_db:
+    yield dependencies stay open until a StreamingResponse ends, so a
+    request-scoped session would hold a pooled connection (and a read
+    transaction that blocks WAL checkpoints) for the life of every stream.
+    The returned user is detached.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired stream ticket",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    async with AsyncSessionLocal() as db:
+        if token:
+            user = await get_user_from_token(db, token)
+        elif ticket:
+            result = await db.execute(
+                delete(StreamTicket)
+                .where(StreamTicket.ticket_hash == _hash_ticket(ticket), StreamTicket.expires_at > datetime.utcnow())
+                .returning(StreamTicket.user_id)
+            )
+            user_id = result.scalar()
+            await db.commit()
+            user = await db.get(User, user_id) if user_id is not None else None
+            if user is None or not user.is_active:
+                raise credentials_exception
+        else:
+            raise credentials_exception
+    return await get_current_admin_user(user)
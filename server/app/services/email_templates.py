@@ -0,0 +1,76 @@
+"""Email Template Rendering
+
+Every email has an HTML and a plain-text template in app/templates/email.
+All of them are loaded and compiled once, when this module is imported,
+and never re-read from disk. HTML templates escape every variable by
+default. The exception is reply bodies, which are admin-authored HTML
+and are sanitized to an allowlist instead. Text templates are rendered
+as-is.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+from app.config.settings import settings
+from app.utils.validation import html_to_text, sanitize_rich_text
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+# Emails with an <name>.html and <name>.txt template
+EMAIL_TEMPLATES = ("contact_notification", "reply", "demo_request_notification")
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    """HTML and plain-text alternatives of one email"""
+    html: str
+    text: str
+
+
+class EmailTemplates:
+    """Precompiled HTML and text templates for every email"""
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=True),
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+            keep_trailing_newline=True,
+        )
+        self.env.globals["from_name"] = settings.SENDGRID_FROM_NAME
+        # Reply bodies are HTML from the admin rich text editor: the HTML
+        # template embeds them sanitized, the text template converts them
+        self.env.filters["sanitize_rich_text"] = sanitize_rich_text
+        self.env.filters["html_to_text"] = html_to_text
+        self.templates = {
+            name: (
+                self.env.get_template(f"{name}.html"),
+                self.env.get_template(f"{name}.txt"),
+            )
+            for name in EMAIL_TEMPLATES
+        }
+
+    def render(self, template_name: str, /, **context) -> RenderedEmail:
+        """
+        Render both alternatives of an email
+
+        Args:
+            template_name: One of EMAIL_TEMPLATES
+            **context: Template variables
+
+        Returns:
+            RenderedEmail with html and text bodies
+        """
+        html_template, text_template = self.templates[template_name]
+        return RenderedEmail(
+            html=html_template.render(context),
+            text=text_template.render(context),
+        )
+
+
+# Global email templates instance
+email_templates = EmailTemplates()
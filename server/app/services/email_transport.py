@@ -0,0 +1,149 @@
+"""Async HTTP Transport for the SendGrid v3 API
+
+One pooled httpx.AsyncClient per worker keeps connections to the provider
+alive between emails, and a semaphore caps how many requests are in
+flight. Sends never block the event loop. Rate limiting (429) and server
+errors (5xx) are retried a few times with backoff, honouring Retry-After,
+and so are failures to connect, where the request never left this host.
+Read and write errors or timeouts are not retried: SendGrid may already
+have accepted the email, and sending it again would deliver it twice.
+Anything that still fails is left to the outbox's own retry schedule.
+
+httpx is imported when the first email is sent, not when the app starts.
+"""
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+from app.config.settings import settings
+
+# Status codes worth retrying right away
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# First retry delay in seconds (doubled each attempt) and the cap for Retry-After
+RETRY_BASE_SECONDS = 0.5
+MAX_RETRY_AFTER_SECONDS = 10
+
+
+class SendGridTransport:
+    """Connection-pooled, concurrency-capped client for POST /v3/mail/send"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_connections: int,
+        timeout: float,
+        max_retries: int
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._client_lock = asyncio.Lock()
+
+    def _build_client(self) -> "httpx.AsyncClient":
+        import httpx
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+        )
+
+    async def _get_client(self) -> "httpx.AsyncClient":
+        async with self._client_lock:
+            if self._client is None:
+                # Importing httpx and loading the CA bundle take tens of
+                # milliseconds; keep both off the event loop
+                self._client = await asyncio.to_thread(self._build_client)
+        return self._client
+
+    def _retry_delay(self, response: Optional["httpx.Response"], attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+        return RETRY_BASE_SECONDS * (2 ** attempt)
+
+    async def send(self, message: dict) -> int:
+        """
+        Send one email
+
+        Args:
+            message: SendGrid v3 mail/send request body
+
+        Returns:
+            HTTP status code of the final attempt
+
+        Raises:
+            httpx.HTTPError: If the last attempt failed to connect, or any
+                attempt failed after the request may have been sent
+        """
+        client = await self._get_client()
+        import httpx  # already loaded by _build_client
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                try:
+                    response = await client.post("/v3/mail/send", json=message)
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                    # The request was never sent, so retrying cannot duplicate it
+                    if attempt == self.max_retries:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                        return response.status_code
+                await asyncio.sleep(self._retry_delay(response, attempt))
+        return response.status_code
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def build_message(
+    from_email: str,
+    from_name: str,
+    to_email: str,
+    to_name: Optional[str],
+    subject: str,
+    text: str,
+    html: str
+) -> dict:
+    """Build a SendGrid v3 mail/send body with plain-text and HTML parts"""
+    recipient = {"email": to_email}
+    if to_name:
+        recipient["name"] = to_name
+    return {
+        "personalizations": [{"to": [recipient]}],
+        "from": {"email": from_email, "name": from_name},
+        "subject": subject,
+        # SendGrid requires text/plain before text/html
+        "content": [
+            {"type": "text/plain", "value": text},
+            {"type": "text/html", "value": html},
+        ],
+    }
+
+
+def create_transport() -> Optional[SendGridTransport]:
+    """Transport for the configured API key, or None when email is disabled"""
+    if not settings.SENDGRID_API_KEY:
+        return None
+    return SendGridTransport(
+        api_key=settings.SENDGRID_API_KEY,
+        base_url=settings.SENDGRID_API_BASE_URL,
+        max_connections=settings.EMAIL_HTTP_MAX_CONNECTIONS,
+        timeout=settings.EMAIL_HTTP_TIMEOUT_SECONDS,
+        max_retries=settings.EMAIL_HTTP_MAX_RETRIES
+    )
@@ -0,0 +1,239 @@
+"""Admin Event Service
+
+Handlers record events with publish_event() in the same transaction as
+the change they describe. Every worker runs one EventBroker that polls the
+`events` table for rows it has not seen yet, but only while dashboards are
+connected to it, and fans them out to its local SSE subscribers. Because
+the events live in the database, a dashboard connected to any worker sees
+changes made on every worker. A reconnecting client sends Last-Event-ID and
+first receives the events it missed.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import AsyncSessionLocal
+from app.config.settings import settings
+from app.models import Event
+
+# Event types streamed to admin dashboards
+EVENT_TYPES = {
+    "message.created",
+    "message.read",
+    "message.unread",
+    "reply.sent",
+    "demo.created",
+    "demo.updated",
+}
+
+# Events replayed to a resuming client at most
+BACKLOG_LIMIT = 1000
+
+# Events buffered per subscriber before it is dropped (and has to resume)
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Seconds between deletions of events older than the retention period
+PRUNE_INTERVAL_SECONDS = 600
+
+
+def publish_event(db: AsyncSession, event_type: str, payload: dict) -> Event:
+    """
+    Record an event as part of the caller's transaction
+
+    Args:
+        db: Session the caller will commit
+        event_type: One of EVENT_TYPES
+        payload: JSON-serializable event data
+
+    Returns:
+        The pending event row
+    """
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown event type: {event_type}")
+
+    event = Event(type=event_type, payload=json.dumps(jsonable_encoder(payload)))
+    db.add(event)
+    return event
+
+
+async def publish_events(db: AsyncSession, events: list[tuple[str, dict]]) -> None:
+    """
+    Record many events with a single executemany, as part of the caller's transaction
+
+    Args:
+        db: Session the caller will commit
+        events: (event_type, payload) pairs
+    """
+    if not events:
+        return
+    for event_type, _ in events:
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+    now = datetime.utcnow()
+    await db.execute(insert(Event), [
+        {"type": event_type, "payload": json.dumps(jsonable_encoder(payload)), "created_at": now}
+        for event_type, payload in events
+    ])
+
+
+class Subscription:
+    """One connected SSE client"""
+
+    def __init__(self, last_id: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.last_id = last_id
+
+    def deliver(self, event: Event) -> bool:
+        """Queue an event unless already delivered; False if the client fell too far behind"""
+        if event.id <= self.last_id:
+            return True
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        self.last_id = event.id
+        return True
+
+    def close(self) -> None:
+        """Signal the stream to end"""
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class EventBroker:
+    """Per-worker fan-out of database events to SSE subscribers"""
+
+    def __init__(self, poll_interval: float, retention_hours: int):
+        self.poll_interval = poll_interval
+        self.retention_hours = retention_hours
+        self.subscribers: set[Subscription] = set()
+        # Highest event id already fanned out by this worker
+        self.last_id: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune = datetime.min
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber, replaying events after last_event_id if given"""
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                if self.last_id is None:
+                    self.last_id = (await db.execute(select(func.max(Event.id)))).scalar() or 0
+
+                if last_event_id is None or last_event_id > self.last_id:
+                    # An id above every stored event came from a database
+                    # that was since restored or rebuilt: resume from now
+                    subscription = Subscription(self.last_id)
+                else:
+                    subscription = Subscription(last_event_id)
+                    result = await db.execute(
+                        select(Event)
+                        .where(Event.id > last_event_id)
+                        .order_by(Event.id)
+                        .limit(BACKLOG_LIMIT)
+                    )
+                    for event in result.scalars():
+                        subscription.deliver(event)
+
+            self.subscribers.add(subscription)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+
+    def notify(self) -> None:
+        """Poll now instead of at the next interval (after a local commit)"""
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        """End all streams and stop polling"""
+        for subscription in list(self.subscribers):
+            subscription.close()
+        self.subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        # Poll only while this worker has subscribers
+        while self.subscribers:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Event stream poll error: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def poll_once(self) -> int:
+        """
+        Fan out events committed since the last poll
+
+        Returns:
+            Number of new events
+        """
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Event)
+                    .where(Event.id > self.last_id)
+                    .order_by(Event.id)
+                    .limit(BACKLOG_LIMIT)
+                )
+                events = list(result.scalars())
+
+                for event in events:
+                    for subscription in list(self.subscribers):
+                        if not subscription.deliver(event):
+                            # Too slow: end the stream, the client resumes from its last id
+                            subscription.close()
+                            self.subscribers.discard(subscription)
+                if events:
+                    self.last_id = events[-1].id
+
+                await self._prune(db)
+        return len(events)
+
+    async def _prune(self, db: AsyncSession) -> None:
+        """Delete events older than the retention period, at most every PRUNE_INTERVAL_SECONDS"""
+        now = datetime.utcnow()
+        if now - self._last_prune < timedelta(seconds=PRUNE_INTERVAL_SECONDS):
+            return
+        self._last_prune = now
+        await db.execute(
+            delete(Event).where(Event.created_at < now - timedelta(hours=self.retention_hours))
+        )
+        await db.commit()
+
+
+def format_sse(event: Event) -> str:
+    """Serialize an event in text/event-stream format"""
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.payload}\n\n"
+
+
+# Global event broker instance
+event_broker = EventBroker(
+    poll_interval=settings.EVENTS_POLL_SECONDS,
+    retention_hours=settings.EVENTS_RETENTION_HOURS
+)
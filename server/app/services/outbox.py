@@ -0,0 +1,297 @@
+"""Email Outbox Service
+
+Request handlers never send email themselves. They insert an EmailOutbox
+row in the same transaction as the record it relates to, and the
+dispatcher running in each worker claims pending rows in batches and sends
+them through EmailService. Because the row is committed with the message,
+a worker restart cannot lose an email, and failed sends are retried with
+exponential backoff.
+
+Claims are leases: a row stuck in 'sending' by a worker that died is picked
+up again once its claim expires. A failed attempt stores the provider's
+error in last_error. Sent rows are deleted EMAIL_OUTBOX_RETENTION_DAYS
+after sending; failed rows are kept for inspection.
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Select, delete, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import AsyncSessionLocal
+from app.config.settings import settings
+from app.models import EmailOutbox, Message, MessageReply
+from app.services.email import email_service
+from app.services.metrics import EMAIL_SEND_DURATION, EMAIL_SEND_FAILURES
+
+# Outbox kinds and the EmailService method that sends each of them
+EMAIL_KINDS = {
+    "contact_notification": "send_contact_notification",
+    "reply": "send_reply_email",
+    "demo_request_notification": "send_demo_request_notification",
+}
+
+# Upper bound for the retry delay
+MAX_RETRY_DELAY_SECONDS = 3600
+
+# Sent rows past the retention period are deleted at most this often
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+def enqueue_email(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    message_id: Optional[int] = None,
+    reply_id: Optional[int] = None,
+    demo_request_id: Optional[int] = None
+) -> EmailOutbox:
+    """
+    Add an email to the outbox as part of the caller's transaction
+
+    Args:
+        db: Session the caller will commit
+        kind: One of EMAIL_KINDS
+        payload: Keyword arguments for the EmailService method
+        message_id: Message whose `delivered` flag is set once sent
+        reply_id: MessageReply whose `delivered` flag is set once sent
+        demo_request_id: Related demo request, for bookkeeping
+
+    Returns:
+        The pending outbox row
+    """
+    if kind not in EMAIL_KINDS:
+        raise ValueError(f"Unknown email kind: {kind}")
+
+    entry = EmailOutbox(
+        kind=kind,
+        payload=json.dumps(payload),
+        message_id=message_id,
+        reply_id=reply_id,
+        demo_request_id=demo_request_id
+    )
+    db.add(entry)
+    return entry
+
+
+def due_emails(now: datetime, limit: int) -> Select:
+    """
+    Ids of up to limit emails to send: expired leases first, then due pending emails
+
+    Each branch walks its own (status, ...) index in order and stops at
+    limit, so claiming never sorts the whole backlog.
+    """
+    expired = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == 'sending', EmailOutbox.claimed_until < now)
+        .order_by(EmailOutbox.claimed_until)
+        .limit(limit)
+        .subquery()
+    )
+    pending = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .subquery()
+    )
+    due = union_all(select(expired.c.id), select(pending.c.id)).subquery()
+    return select(due.c.id).limit(limit)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff delay after the given number of failed attempts"""
+    seconds = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, MAX_RETRY_DELAY_SECONDS))
+
+
+class OutboxDispatcher:
+    """Background task that sends pending outbox emails"""
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        lease_seconds: int,
+        retention_days: float
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retention_days = retention_days
+        self._last_prune = datetime.min
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the dispatch loop in the running event loop"""
+        if not email_service._is_configured():
+            print("⚠️  Email outbox dispatcher not started: SendGrid is not configured. Emails stay queued.")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the dispatch loop; claimed rows are retried after their lease expires"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Process the outbox now instead of waiting for the next poll"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+                await self.prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Email outbox dispatch error: {e}")
+                processed = 0
+
+            # Keep draining while batches come back full
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _claim_batch(self, db: AsyncSession) -> list[EmailOutbox]:
+        """Atomically lease up to batch_size due rows to this dispatcher"""
+        now = datetime.utcnow()
+        claim = uuid.uuid4().hex
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due_emails(now, self.batch_size)))
+            .values(
+                status='sending',
+                claimed_by=claim,
+                claimed_until=now + timedelta(seconds=self.lease_seconds),
+                attempts=EmailOutbox.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        result = await db.execute(
+            select(EmailOutbox).where(
+                EmailOutbox.claimed_by == claim,
+                EmailOutbox.status == 'sending'
+            )
+        )
+        return list(result.scalars().all())
+
+    async def _send(self, entry: EmailOutbox) -> bool:
+        method = getattr(email_service, EMAIL_KINDS[entry.kind])
+        start = time.perf_counter()
+        try:
+            sent = await method(**json.loads(entry.payload))
+        except Exception as e:
+            # EmailService raises EmailDeliveryError for rejected emails and
+            # lets transport errors through, so this is the real failure
+            entry.last_error = f"{type(e).__name__}: {e}"
+            sent = False
+        EMAIL_SEND_DURATION.labels(entry.kind).observe(time.perf_counter() - start)
+        if not sent:
+            EMAIL_SEND_FAILURES.labels(entry.kind).inc()
+        return sent
+
+    async def run_once(self) -> int:
+        """
+        Claim and send one batch of due emails
+
+        Returns:
+            Number of emails processed (sent or failed)
+        """
+        async with AsyncSessionLocal() as db:
+            entries = await self._claim_batch(db)
+            if not entries:
+                return 0
+
+            results = await asyncio.gather(*(self._send(entry) for entry in entries))
+
+            now = datetime.utcnow()
+            delivered_messages = []
+            delivered_replies = []
+            for entry, sent in zip(entries, results):
+                entry.claimed_by = None
+                entry.claimed_until = None
+                if sent:
+                    entry.status = 'sent'
+                    entry.sent_at = now
+                    entry.last_error = None
+                    if entry.message_id:
+                        delivered_messages.append(entry.message_id)
+                    if entry.reply_id:
+                        delivered_replies.append(entry.reply_id)
+                elif entry.attempts >= self.max_attempts:
+                    entry.status = 'failed'
+                    entry.last_error = entry.last_error or "SendGrid is not configured"
+                    print(f"❌ Giving up on outbox email {entry.id} after {entry.attempts} attempts")
+                else:
+                    entry.status = 'pending'
+                    entry.next_attempt_at = now + retry_delay(entry.attempts)
+                    entry.last_error = entry.last_error or "SendGrid is not configured"
+
+            # Record delivery status on the related records
+            if delivered_messages:
+                await db.execute(
+                    update(Message)
+                    .where(Message.id.in_(delivered_messages))
+                    .values(delivered=True)
+                    .execution_options(synchronize_session=False)
+                )
+            if delivered_replies:
+                await db.execute(
+                    update(MessageReply)
+                    .where(MessageReply.id.in_(delivered_replies))
+                    .values(delivered=True)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+            return len(entries)
+
+    async def prune(self) -> int:
+        """
+        Delete sent emails older than the retention period, at most every PRUNE_INTERVAL_SECONDS
+
+        Returns:
+            Number of rows deleted
+        """
+        now = datetime.utcnow()
+        if self.retention_days <= 0 or now - self._last_prune < timedelta(seconds=PRUNE_INTERVAL_SECONDS):
+            return 0
+        self._last_prune = now
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(EmailOutbox).where(
+                    EmailOutbox.status == 'sent',
+                    EmailOutbox.sent_at < now - timedelta(days=self.retention_days)
+                )
+            )
+            await db.commit()
+            return result.rowcount
+
+
+# Global outbox dispatcher instance
+outbox_dispatcher = OutboxDispatcher(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    retention_days=settings.EMAIL_OUTBOX_RETENTION_DAYS
+)
@@ -0,0 +1,75 @@
+"""Password Hashing Service
+
+bcrypt is deliberately slow (~250 ms per hash), so running it directly inside
+an async endpoint freezes every other request on the worker. This service
+runs hashing and verification in a bounded thread pool (bcrypt releases the
+GIL while hashing) and rejects work with 503 when the pool is saturated.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException, status
+
+from app.config.settings import settings
+from app.services.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTIONS
+
+
+def _timed(func, *args):
+    """Call func in the worker thread and record how long bcrypt took"""
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        PASSWORD_HASH_DURATION.labels(func.__name__).observe(time.perf_counter() - start)
+
+
+class PasswordHasher:
+    """Runs bcrypt operations off the event loop with bounded concurrency"""
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Running + queued operations; only touched from the event loop thread
+        self._pending = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def run(self, func, *args):
+        """Run a hashing function in the pool, failing fast when too much work is queued"""
+        if self._pending >= self.max_workers + self.queue_limit:
+            PASSWORD_HASH_REJECTIONS.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, _timed, func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        """Stop the thread pool, waiting for running operations"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT
+)
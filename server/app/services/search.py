@@ -0,0 +1,152 @@
+"""Full-Text Search Service (SQLite FTS5)
+
+Each searchable table has an external-content FTS5 index kept in sync by
+triggers, so the index only stores tokens and searches never scan the base
+table. Results are ranked with bm25 and come with a highlighted snippet.
+"""
+import html
+import re
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Searchable tables: FTS table name -> (content table, indexed columns, bm25 column weights)
+SEARCH_INDEXES = {
+    "messages_fts": ("messages", ["name", "email", "subject", "message"], [3.0, 2.0, 4.0, 1.0]),
+    "demo_requests_fts": ("demo_requests", ["full_name", "company_name", "message", "notes"], [3.0, 3.0, 1.0, 1.0]),
+}
+
+# Private-use characters mark matches inside snippets until the text is escaped
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+
+# Words shown around matches in a snippet
+SNIPPET_TOKENS = 16
+
+
+def create_search_indexes(engine: Engine) -> list[str]:
+    """
+    Create missing FTS5 tables and their sync triggers (SQLite only)
+
+    Returns:
+        List of FTS tables that were created (and filled from existing rows)
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+
+    created = []
+    with engine.begin() as conn:
+        for fts_table, (table, columns, _) in SEARCH_INDEXES.items():
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": fts_table}
+            ).first()
+
+            cols = ", ".join(columns)
+            new_cols = ", ".join(f"new.{c}" for c in columns)
+            old_cols = ", ".join(f"old.{c}" for c in columns)
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+                f"{cols}, content='{table}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+            ))
+            # Only re-index when searchable text changes, not on read/status updates
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+                f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+
+            if not exists:
+                conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+                created.append(fts_table)
+
+    return created
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word becomes a quoted prefix term, so user input can never be
+    parsed as FTS5 syntax, and all words must match.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word")
+    return " ".join(f'"{word}"*' for word in words[:16])
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet and wrap matches in <mark> tags"""
+    if not snippet:
+        return ""
+    return (
+        html.escape(snippet)
+        .replace(_MATCH_START, "<mark>")
+        .replace(_MATCH_END, "</mark>")
+    )
+
+
+async def search(
+    db: AsyncSession,
+    fts_table: str,
+    select_columns: list[str],
+    query: str,
+    limit: int,
+    offset: int
+) -> tuple[list[dict], Optional[int]]:
+    """
+    Run a ranked full-text search
+
+    Args:
+        db: Database session
+        fts_table: One of SEARCH_INDEXES
+        select_columns: Base table columns to return for each hit
+        query: Free text entered by the admin
+        limit: Page size
+        offset: Number of hits to skip
+
+    Returns:
+        Tuple of (hits, next_offset); next_offset is None on the last page
+    """
+    if db.bind.dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Full-text search requires SQLite FTS5")
+
+    table, _, weights = SEARCH_INDEXES[fts_table]
+    columns = ", ".join(f"t.{c}" for c in select_columns)
+    result = await db.execute(
+        text(
+            f"SELECT {columns}, "
+            f"snippet({fts_table}, -1, :start, :end, '…', {SNIPPET_TOKENS}) AS snippet, "
+            f"bm25({fts_table}, {', '.join(map(str, weights))}) AS rank "
+            f"FROM {fts_table} JOIN {table} AS t ON t.id = {fts_table}.rowid "
+            f"WHERE {fts_table} MATCH :match "
+            f"ORDER BY rank LIMIT :limit OFFSET :offset"
+        ),
+        {
+            "start": _MATCH_START,
+            "end": _MATCH_END,
+            "match": build_match_query(query),
+            "limit": limit + 1,
+            "offset": offset,
+        }
+    )
+    rows = [dict(row) for row in result.mappings().all()]
+
+    has_more = len(rows) > limit
+    hits = rows[:limit]
+    for hit in hits:
+        hit["snippet"] = highlight(hit["snippet"])
+    return hits, (offset + limit if has_more else None)
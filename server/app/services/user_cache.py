@@ -0,0 +1,149 @@
+"""Authenticated User Cache
+
+get_current_user runs on every admin request. Caching the resolved user
+for a short TTL saves one SELECT on `users` per request. Cached entries are
+detached snapshots, never live ORM instances, so they can be shared safely
+between concurrent requests.
+
+The cache is per worker process. Handlers that change a user's
+credentials or status must call invalidate(). It drops the entry locally
+and bumps a generation counter that all workers on the host share through a
+small memory-mapped file. Every lookup compares that counter with the
+generation the local cache was filled under, which is a memory read and
+no query. On a mismatch the whole local cache is emptied. A deactivation or
+password change therefore takes effect on the next request on every worker.
+Such changes are rare, so emptying the whole cache costs little. Updates
+that do not affect authentication, like last_login on every login, only
+replace the local entry with set() and leave the other workers' caches
+alone until their entries expire.
+"""
+import mmap
+import struct
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.config.database import BASE_DIR, DATABASE_URL
+from app.config.settings import settings
+from app.models import User
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, development only
+    fcntl = None
+
+_COUNTER = struct.Struct("<Q")
+
+
+def default_generation_path() -> str:
+    """Place the shared generation file next to the main SQLite database"""
+    url = make_url(DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+        return str(Path(url.database).parent / "usercache.gen")
+    return str(BASE_DIR / "usercache.gen")
+
+
+class SharedGeneration:
+    """Counter shared by every worker process on this host through a memory-mapped file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._map: Optional[mmap.mmap] = None
+
+    def _mapping(self) -> mmap.mmap:
+        # Opened on first use so importing the app creates no files
+        if self._map is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+b") as f:
+                if f.seek(0, 2) < _COUNTER.size:
+                    f.truncate(_COUNTER.size)
+                self._map = mmap.mmap(f.fileno(), _COUNTER.size)
+        return self._map
+
+    def read(self) -> int:
+        return _COUNTER.unpack_from(self._mapping())[0]
+
+    def bump(self) -> None:
+        """Increment the counter; flock serializes concurrent bumps from several workers"""
+        mapping = self._mapping()
+        with open(self.path, "r+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                _COUNTER.pack_into(mapping, 0, _COUNTER.unpack_from(mapping)[0] + 1)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class UserCache:
+    """Bounded LRU cache of users keyed by username, with per-entry TTL"""
+
+    def __init__(self, max_size: int, ttl_seconds: float, generation: SharedGeneration):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.generation = generation
+        self._generation_seen: Optional[int] = None
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, username: str) -> Optional[User]:
+        """Return the cached user snapshot, or None if missing, expired or invalidated by any worker"""
+        if not self.enabled:
+            return None
+        generation = self.generation.read()
+        if generation != self._generation_seen:
+            self._entries.clear()
+            self._generation_seen = generation
+            return None
+
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[username]
+            return None
+
+        self._entries.move_to_end(username)
+        return user
+
+    def set(self, user: User) -> None:
+        """Cache a detached snapshot of user"""
+        if not self.enabled or self._generation_seen is None:
+            return
+
+        snapshot = User(**{
+            column.key: getattr(user, column.key)
+            for column in User.__table__.columns
+        })
+        self._entries[user.username] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(user.username)
+
+        # Evict least recently used entries
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Drop a user so the next request on every worker reloads it from the database"""
+        self._entries.pop(username, None)
+        if self.enabled:
+            self.generation.bump()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global user cache instance
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    generation=SharedGeneration(settings.USER_CACHE_GENERATION_PATH or default_generation_path())
+)
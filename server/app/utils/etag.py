@@ -0,0 +1,92 @@
+"""Conditional GET helpers for admin list endpoints
+
+A collection's validator is built from a few aggregates per table (row
+count, max id and max updated_at), which SQLite answers from indexes
+without reading the rows. When the client's If-None-Match matches, the
+endpoint returns 304 before running the list query or serializing anything.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Browsers revalidate on every poll instead of reusing a stale copy
+CACHE_CONTROL = "private, no-cache"
+
+
+def _aggregates(model) -> list:
+    """Scalar subqueries that change whenever a row is added, changed or deleted"""
+    columns = [
+        select(func.count()).select_from(model).scalar_subquery(),
+        select(func.max(model.id)).scalar_subquery(),
+    ]
+    if hasattr(model, "updated_at"):
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    return columns
+
+
+def collection_state(*models) -> Select:
+    """One-row SELECT of the aggregates of every model, in order"""
+    return select(*[column for model in models for column in _aggregates(model)])
+
+
+async def collection_etag(db: AsyncSession, request: Request, *models) -> str:
+    """
+    Compute a weak ETag for a list endpoint in one aggregate query
+
+    Args:
+        db: Database session
+        request: Current request; its path and query string are part of the tag
+        models: Tables whose contents the response depends on
+
+    Returns:
+        Weak ETag header value
+    """
+    values = (await db.execute(collection_state(*models))).one()
+
+    digest = hashlib.sha1()
+    digest.update(request.url.path.encode("utf-8"))
+    digest.update(str(request.url.query).encode("utf-8"))
+    digest.update(repr(tuple(values)).encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def conditional_get(
+    db: AsyncSession,
+    request: Request,
+    response: Response,
+    *models
+) -> Optional[Response]:
+    """
+    Handle If-None-Match for a list endpoint
+
+    Args:
+        db: Database session
+        request: Current request
+        response: Response the endpoint will return; receives the ETag
+        models: Tables whose contents the response depends on
+
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    etag = await collection_etag(db, request, *models)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,61 @@
+"""Fast JSON responses for large admin lists
+
+By default FastAPI validates every row an endpoint returns through its
+response_model and then encodes the result. For list endpoints that means
+one ORM object and one Pydantic model per row, which dominates CPU time
+once lists grow to thousands of rows. Here the endpoint selects only the
+columns of its output schema and the plain row tuples go straight to
+orjson. The response_model stays on the route for the OpenAPI schema.
+"""
+from typing import Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# orjson writes naive datetimes as "YYYY-MM-DDTHH:MM:SS[.ffffff]", matching
+# Pydantic's JSON output for the same values
+JSON_MEDIA_TYPE = "application/json"
+
+
+def schema_columns(schema: type[BaseModel], model, **expressions) -> list:
+    """
+    Columns to select so each row has exactly the fields of an output schema
+
+    Args:
+        schema: Pydantic output schema whose field names become the JSON keys
+        model: ORM model providing a column for each field
+        **expressions: Column expressions for fields the model has no column for
+
+    Returns:
+        Column list for select(), labelled with the schema's field names
+    """
+    return [
+        expressions[name].label(name) if name in expressions else getattr(model, name)
+        for name in schema.model_fields
+    ]
+
+
+def json_rows(
+    keys: Sequence[str],
+    rows: Iterable[Sequence],
+    response: Optional[Response] = None
+) -> Response:
+    """
+    Serialize column tuples to a JSON array of objects without per-row models
+
+    Args:
+        keys: Field names, in the order of each row's values
+        rows: Row tuples from a column select
+        response: Injected endpoint response whose headers (ETag, X-Next-Cursor) are kept
+
+    Returns:
+        Ready-to-send JSON response
+    """
+    # orjson only accepts exact str keys; column names may be quoted_name (a str subclass)
+    keys = [str(key) for key in keys]
+    body = orjson.dumps([dict(zip(keys, row)) for row in rows])
+    fast = Response(content=body, media_type=JSON_MEDIA_TYPE)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
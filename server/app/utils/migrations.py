@@ -0,0 +1,242 @@
+"""Lightweight Schema Upgrades
+
+Base.metadata.create_all() only creates missing tables; it never alters
+tables that already exist. These helpers bring an existing production
+database up to date with the models in place, and are safe to run on
+every startup.
+"""
+import argparse
+import datetime
+import sys
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.sql.schema import Column
+
+from app.config.database import Base
+from app.services.search import create_search_indexes
+
+
+def _column_default_sql(column: Column, engine: Engine) -> str:
+    """Render a scalar Python-side column default as a SQL DEFAULT clause"""
+    default = column.default
+    if default is None or not default.is_scalar:
+        return ""
+    literal = column.type.literal_processor(engine.dialect)
+    value = literal(default.arg) if literal else repr(default.arg)
+    return f" DEFAULT {value}"
+
+
+def add_missing_columns(engine: Engine) -> list[str]:
+    """
+    Add model columns that are missing from existing tables
+
+    Args:
+        engine: Engine bound to the database to upgrade
+
+    Returns:
+        List of "table.column" names that were added
+    """
+    added = []
+
+    with engine.begin() as conn:
+        # Inspect through the open connection; inspect(engine) would check
+        # out a second one from the pool
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                default = _column_default_sql(column, engine)
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}'
+                ))
+                added.append(f"{table.name}.{column.name}")
+
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> list[str]:
+    """
+    Create model indexes that are missing from existing tables
+
+    Args:
+        engine: Engine bound to the database to upgrade
+
+    Returns:
+        List of index names that were created
+    """
+    created = []
+
+    with engine.begin() as conn:
+        # Inspect through the open connection; inspect(engine) would check
+        # out a second one from the pool
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=conn, checkfirst=True)
+                    created.append(index.name)
+
+    return created
+
+
+def rebuild_autoincrement_tables(engine: Engine) -> list[str]:
+    """
+    Rebuild tables created before their model asked for AUTOINCREMENT (SQLite only)
+
+    Without AUTOINCREMENT SQLite hands out max(id) + 1, so the id of a
+    deleted newest row is reused. SQLite cannot add AUTOINCREMENT to an
+    existing table: the table is recreated under a temporary name, the rows
+    are copied with their ids, the old table is dropped and the new one
+    renamed. Indexes and full-text triggers are recreated by the later
+    upgrade steps. The app does not enable foreign key enforcement, so
+    dropping a referenced table leaves the referencing rows untouched.
+
+    Args:
+        engine: Engine bound to the database to upgrade
+
+    Returns:
+        List of tables that were rebuilt
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+
+    rebuilt = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not table.dialect_options["sqlite"]["autoincrement"]:
+                continue
+            sql = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": table.name}
+            ).scalar()
+            if sql is None or "AUTOINCREMENT" in sql.upper():
+                continue
+
+            existing_columns = {col["name"] for col in inspect(conn).get_columns(table.name)}
+            columns = ", ".join(col.name for col in table.columns if col.name in existing_columns)
+            new_name = f"{table.name}_rebuild"
+            create_sql = str(CreateTable(table).compile(dialect=engine.dialect))
+            conn.execute(text(create_sql.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {new_name} ", 1)))
+            conn.execute(text(
+                f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name}"
+            ))
+            conn.execute(text(f"DROP TABLE {table.name}"))
+            conn.execute(text(f"ALTER TABLE {new_name} RENAME TO {table.name}"))
+            rebuilt.append(table.name)
+
+    return rebuilt
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Apply all schema upgrades to an existing database"""
+    for name in add_missing_columns(engine):
+        print(f"✅ Added column {name}")
+    for name in rebuild_autoincrement_tables(engine):
+        print(f"✅ Rebuilt table {name} with AUTOINCREMENT ids")
+    for name in create_missing_indexes(engine):
+        print(f"✅ Created index {name}")
+    for name in create_search_indexes(engine):
+        print(f"✅ Created full-text index {name}")
+
+
+def hot_queries() -> dict:
+    """
+    The statements behind the busiest endpoints, with representative parameters
+
+    Built with the same functions the routers and background services call,
+    so the plans checked here are the plans of the SQL they actually run.
+    """
+    from app.models import DemoRequest, Message, MessageReply, User
+    from app.services.archive import demo_requests_due_for_archiving, messages_due_for_archiving
+    from app.services.outbox import due_emails
+    from app.utils import queries
+    from app.utils.etag import collection_state
+
+    now = datetime.datetime(2025, 1, 1)
+    return {
+        "messages: newest page": queries.message_page(51),
+        "messages: next page": queries.message_page(51, after=(now, 100)),
+        "messages: unread page": queries.message_page(51, is_read=False),
+        "messages: by sender": queries.message_page(51, email="client@example.com"),
+        "message_replies: by message": queries.message_replies(1),
+        "messages: summary": queries.message_summary(now),
+        "messages: list etag": collection_state(Message, MessageReply),
+        "demo_requests: newest": queries.demo_request_list(),
+        "demo_requests: list etag": collection_state(DemoRequest),
+        "users: by reset token": queries.user_by_reset_token("token"),
+        "users: newest": queries.user_list(),
+        "users: list etag": collection_state(User),
+        "messages: due for archiving": messages_due_for_archiving(now, 500, skipped={1}),
+        "demo_requests: due for archiving": demo_requests_due_for_archiving(now, 500, skipped={1}),
+        "email_outbox: due": due_emails(now, 20),
+    }
+
+
+def explain_hot_queries(engine: Engine) -> dict:
+    """
+    Run EXPLAIN QUERY PLAN (SQLite) for every hot query
+
+    Returns:
+        {query name: (uses_index, [plan detail lines])}
+    """
+    results = {}
+    with engine.connect() as conn:
+        for name, statement in hot_queries().items():
+            sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            # Scanning a subquery's result only reads the rows its own plan produced
+            subqueries = {
+                detail.split()[-1] for detail in plan
+                if detail.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+            }
+            # A full table scan or a sort outside an index means no index helped
+            uses_index = not any(
+                (
+                    detail.startswith("SCAN ") and " USING " not in detail
+                    and detail != "SCAN CONSTANT ROW" and detail.split()[1] not in subqueries
+                )
+                or "TEMP B-TREE" in detail
+                for detail in plan
+            )
+            results[name] = (uses_index, plan)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Upgrade the database schema in place")
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Check that every hot query uses an index (exit code 1 if not)"
+    )
+    args = parser.parse_args()
+
+    from app.config.database import engine, init_db
+    init_db()
+
+    if not args.explain:
+        return 0
+
+    failures = 0
+    for name, (uses_index, plan) in explain_hot_queries(engine).items():
+        print(f"{'✅' if uses_index else '❌'} {name}")
+        for detail in plan:
+            print(f"     {detail}")
+        failures += not uses_index
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Statements Behind the Hot Read Endpoints
+
+The routers build their busiest SELECTs with these functions, and
+`python -m app.utils.migrations --explain` plans the very same statements,
+so the index check cannot drift from the SQL the endpoints run.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, and_, func, or_, select
+
+from app.models import DemoRequest, Message, MessageReply, User
+from app.schemas import DemoRequestOut, MessageOut, UserOut
+from app.utils.fast_json import schema_columns
+
+
+def message_page(
+    limit: int,
+    after: Optional[tuple[datetime, int]] = None,
+    is_read: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    email: Optional[str] = None
+) -> Select:
+    """
+    One page of messages, newest first, with their reply counts
+
+    Args:
+        limit: Rows to fetch
+        after: (timestamp, id) of the last row of the previous page
+        is_read, since, until, email: Optional filters
+
+    Returns:
+        SELECT of MessageOut columns ordered by (timestamp, id) descending
+    """
+    reply_count = (
+        select(func.count(MessageReply.id))
+        .where(MessageReply.message_id == Message.id)
+        .correlate(Message)
+        .scalar_subquery()
+    )
+    query = select(*schema_columns(MessageOut, Message, reply_count=reply_count))
+
+    if is_read is not None:
+        query = query.where(Message.is_read == is_read)
+    if since is not None:
+        query = query.where(Message.timestamp >= since)
+    if until is not None:
+        query = query.where(Message.timestamp < until)
+    if email:
+        query = query.where(Message.email == email)
+
+    # Keyset condition: strictly after the last row of the previous page
+    if after is not None:
+        last_timestamp, last_id = after
+        query = query.where(or_(
+            Message.timestamp < last_timestamp,
+            and_(Message.timestamp == last_timestamp, Message.id < last_id)
+        ))
+
+    return query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit)
+
+
+def message_replies(message_id: int) -> Select:
+    """Replies to a message in send order, joined with the replying admin's username"""
+    return (
+        select(MessageReply, User.username)
+        .outerjoin(User, User.id == MessageReply.admin_id)
+        .where(MessageReply.message_id == message_id)
+        .order_by(MessageReply.sent_at, MessageReply.id)
+    )
+
+
+def message_summary(today_start: datetime) -> Select:
+    """Dashboard counts: total, unread, replied and received since today_start"""
+    def count(*conditions):
+        return select(func.count()).select_from(Message).where(*conditions).scalar_subquery()
+
+    return select(
+        count().label("total"),
+        count(Message.is_read == False).label("unread"),
+        select(func.count(func.distinct(MessageReply.message_id))).scalar_subquery().label("replied"),
+        count(Message.timestamp >= today_start).label("today"),
+    )
+
+
+def demo_request_list() -> Select:
+    """Every demo request, newest first"""
+    return select(*schema_columns(DemoRequestOut, DemoRequest)).order_by(DemoRequest.timestamp.desc())
+
+
+def user_list() -> Select:
+    """Every user, newest first"""
+    return select(*schema_columns(UserOut, User)).order_by(User.created_at.desc())
+
+
+def user_by_reset_token(token: str) -> Select:
+    """The user a password reset token was issued to"""
+    return select(User).where(User.reset_token == token)
@@ -0,0 +1,153 @@
+"""Per-request SQL statistics
+
+SQLAlchemy cursor events count every statement, time it, and remember
+which statements repeat and which were slow. The numbers go into the
+QueryStats objects that enclosing track_queries() blocks put in a context
+variable. Async sessions run their statements in greenlets that share the
+request's context, so this works the same for the sync and async engines.
+Blocks nest: a statement counts towards every enclosing block. Statements
+issued outside any block are not recorded.
+
+Endpoints declare how many statements they may issue with @query_budget(n).
+Endpoints whose statement count grows with the request, like batches,
+declare a per-item allowance too and report their item count with
+set_budget_items().
+Code that must stay within a budget can also be wrapped in
+assert_max_queries(n), which raises QueryBudgetExceeded.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+
+from app.config.settings import settings
+
+# A statement repeated this many times in one scope is reported as a likely N+1
+REPEATED_STATEMENT_THRESHOLD = 5
+
+# ASGI scope key holding the item count reported with set_budget_items()
+BUDGET_ITEMS_SCOPE_KEY = "query_budget_items"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More SQL statements ran than the budget allows"""
+
+
+class QueryStats:
+    """Statements executed and time spent in the database within one scope"""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        # SQL text -> times executed
+        self.statements: dict[str, int] = {}
+        # (SQL text, seconds) of statements slower than DB_SLOW_QUERY_MS
+        self.slow: list[tuple[str, float]] = []
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+        if duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+            self.slow.append((statement, duration))
+
+    def repeated(self, threshold: int = REPEATED_STATEMENT_THRESHOLD) -> list[tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first"""
+        return sorted(
+            ((sql, n) for sql, n in self.statements.items() if n >= threshold),
+            key=lambda item: -item[1]
+        )
+
+    def summary(self, limit: int = 5) -> str:
+        """Human-readable report of the most frequent statements"""
+        top = sorted(self.statements.items(), key=lambda item: -item[1])[:limit]
+        lines = [f"{self.count} statements, {self.duration * 1000:.1f} ms"]
+        lines += [f"  {n}x {' '.join(sql.split())[:200]}" for sql, n in top]
+        return "\n".join(lines)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    duration = time.perf_counter() - getattr(context, "_query_start", time.perf_counter())
+    while stats is not None:
+        stats.record(statement, duration)
+        stats = stats.parent
+
+
+def install_query_listeners(sync_engine: Engine) -> None:
+    """Count and time every statement executed through this engine"""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statistics for the statements executed inside this block"""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail if the block executes more than max_queries statements
+
+    Raises:
+        QueryBudgetExceeded: With the most frequent statements, on exit
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(f"Query budget of {max_queries} exceeded: {stats.summary()}")
+
+
+def query_budget(max_queries: int, per_item: int = 0):
+    """
+    Declare the most SQL statements an endpoint may execute per request
+
+    Checked by QueryDebugMiddleware: logged in DEBUG, and turned into a 500
+    response when QUERY_BUDGET_ENFORCE is on (for test and benchmark runs).
+    Place it below the route decorator.
+
+    Args:
+        max_queries: Statements allowed regardless of the request
+        per_item: Extra statements allowed per item reported with set_budget_items()
+    """
+    def decorator(endpoint):
+        endpoint.__query_budget__ = (max_queries, per_item)
+        return endpoint
+    return decorator
+
+
+def set_budget_items(request: Request, items: int) -> None:
+    """Report how many items this request handles, for @query_budget(n, per_item=m)"""
+    request.scope[BUDGET_ITEMS_SCOPE_KEY] = items
+
+
+def get_query_budget(endpoint, items: int = 0) -> Optional[int]:
+    """Budget declared on an endpoint with @query_budget for a request with items items, if any"""
+    budget = getattr(endpoint, "__query_budget__", None)
+    if budget is None:
+        return None
+    max_queries, per_item = budget
+    return max_queries + per_item * items
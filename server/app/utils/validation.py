@@ -1,6 +1,7 @@
 """Input validation and sanitization utilities"""
 import re
 import html
+from html.parser import HTMLParser
 from typing import Optional
 
 
@@ -160,3 +161,187 @@ def validate_url(url: str) -> bool:
     pattern = r'^https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(/.*)?$'
     return bool(re.match(pattern, url))
 
+
+
+# Markup the admin RichTextEditor produces (execCommand formatting, lists,
+# alignment and the signature block); everything else is dropped
+RICH_TEXT_TAGS = {
+    "p", "div", "span", "br", "b", "strong", "i", "em", "u", "s", "strike",
+    "ul", "ol", "li", "a", "blockquote",
+}
+RICH_TEXT_VOID_TAGS = {"br"}
+RICH_TEXT_STYLES = {
+    "text-align", "color", "font-size", "font-weight", "font-style", "text-decoration",
+    "margin", "margin-top", "margin-bottom", "padding", "padding-top", "padding-bottom", "border-top",
+}
+RICH_TEXT_URL_SCHEMES = ("http://", "https://", "mailto:")
+# Tags whose content is dropped along with the tag
+_DROPPED_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "template", "title", "head"}
+_SAFE_STYLE_VALUE = re.compile(r"^[#\w\s.,%()-]*$")
+_BLOCK_TAGS = {"p", "div", "ul", "ol", "li", "blockquote"}
+
+
+def _clean_style(style: str) -> str:
+    declarations = []
+    for declaration in style.split(";"):
+        name, sep, value = declaration.partition(":")
+        name, value = name.strip().lower(), value.strip()
+        if (
+            sep and name in RICH_TEXT_STYLES and _SAFE_STYLE_VALUE.match(value)
+            and "url(" not in value.lower() and "expression" not in value.lower()
+        ):
+            declarations.append(f"{name}: {value}")
+    return "; ".join(declarations)
+
+
+class _RichTextSanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.open_tags: list[str] = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _DROPPED_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in RICH_TEXT_TAGS:
+            return
+        kept = []
+        for name, value in attrs:
+            value = value or ""
+            if name == "style":
+                value = _clean_style(value)
+                if value:
+                    kept.append((name, value))
+            elif tag == "a" and name == "href":
+                if value.strip().lower().startswith(RICH_TEXT_URL_SCHEMES):
+                    kept.append((name, value.strip()))
+            elif tag == "a" and name == "title":
+                kept.append((name, value))
+        if tag in ("li", "p") and self.open_tags and self.open_tags[-1] == tag:
+            # <li>one<li>two: an unclosed item ends where the next one starts
+            self.handle_endtag(tag)
+        rendered = "".join(f' {name}="{html.escape(value, quote=True)}"' for name, value in kept)
+        self.parts.append(f"<{tag}{rendered}>")
+        if tag not in RICH_TEXT_VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in RICH_TEXT_VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in _DROPPED_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close any tags left open inside this one so the output stays balanced
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.parts.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.parts.append(html.escape(data, quote=False))
+
+    def result(self) -> str:
+        self.close()
+        return "".join(self.parts) + "".join(f"</{tag}>" for tag in reversed(self.open_tags))
+
+
+def sanitize_rich_text(text: str) -> str:
+    """
+    Reduce admin-authored HTML to the allowlisted tags, attributes and styles
+
+    Args:
+        text: HTML from the rich text editor
+
+    Returns:
+        HTML that is safe to embed unescaped in an email
+    """
+    if not text:
+        return ""
+    sanitizer = _RichTextSanitizer()
+    sanitizer.feed(text.replace("\x00", ""))
+    return sanitizer.result()
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.dropping = 0
+        self.list_stack: list[list] = []
+        self.href: Optional[str] = None
+
+    def _newline(self):
+        if self.parts and not self.parts[-1].endswith("\n"):
+            self.parts.append("\n")
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _DROPPED_CONTENT_TAGS:
+            self.dropping += 1
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag in ("ul", "ol"):
+            self._newline()
+            self.list_stack.append([tag, 0])
+        elif tag == "li":
+            self._newline()
+            if self.list_stack and self.list_stack[-1][0] == "ol":
+                self.list_stack[-1][1] += 1
+                self.parts.append(f"{self.list_stack[-1][1]}. ")
+            else:
+                self.parts.append("- ")
+        elif tag in _BLOCK_TAGS:
+            self._newline()
+        elif tag == "a":
+            href = (dict(attrs).get("href") or "").strip()
+            self.href = href if href.lower().startswith(("http://", "https://")) else None
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in _DROPPED_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+        elif tag in ("ul", "ol"):
+            if self.list_stack:
+                self.list_stack.pop()
+            self._newline()
+        elif tag in _BLOCK_TAGS:
+            self._newline()
+        elif tag == "a" and self.href:
+            self.parts.append(f" ({self.href})")
+            self.href = None
+
+    def handle_data(self, data):
+        if not self.dropping:
+            # Source formatting whitespace is not part of the text
+            self.parts.append(re.sub(r"\s+", " ", data))
+
+    def result(self) -> str:
+        self.close()
+        lines = [line.strip() for line in "".join(self.parts).split("\n")]
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def html_to_text(text: str) -> str:
+    """
+    Convert admin-authored HTML to plain text for the text/plain email part
+
+    Args:
+        text: HTML from the rich text editor
+
+    Returns:
+        Text with line breaks for blocks and <br>, list bullets and link targets
+    """
+    if not text:
+        return ""
+    extractor = _TextExtractor()
+    extractor.feed(text)
+    return extractor.result()
@@ -0,0 +1 @@
+"""Performance benchmarks (run from the server directory with `python -m benchmarks.<name>`)"""
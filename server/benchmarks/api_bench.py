@@ -0,0 +1,239 @@
+"""
+End-to-end API benchmark
+
+Seeds a fresh SQLite database (see benchmarks.seed), starts the real
+application under uvicorn on it, and drives each scenario below with a
+fixed number of concurrent clients over HTTP. Reports p50/p95/p99 latency,
+throughput and status codes per scenario as JSON, so runs on two commits
+can be compared directly.
+
+Login requests send a distinct X-Forwarded-For each, so the per-IP login
+rate limit does not turn the scenario into a 429 benchmark.
+
+Usage:
+    python -m benchmarks.api_bench [--dataset 10k|100k|1m] [--concurrency 8]
+                                   [--requests 200] [--workers 1] [--output results.json]
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datasets import BENCH_ADMIN_PASSWORD, BENCH_ADMIN_USERNAME, DATASETS
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def build_scenarios(message_count: int, rng: random.Random) -> dict:
+    """Scenario name -> function(i, token) returning (method, url, request kwargs)"""
+    def message_id() -> int:
+        return rng.randint(1, message_count)
+
+    contact = {"name": "Bench Visitor", "email": "visitor@example.com",
+               "subject": "Benchmark", "message": "Hello from the benchmark suite"}
+    demo = {"platform_id": "p1", "platform_name": "Platform 1", "platform_category": "security",
+            "full_name": "Bench Prospect", "email": "prospect@example.com", "phone": "+216 00 000 000"}
+
+    login = {"username": BENCH_ADMIN_USERNAME, "password": BENCH_ADMIN_PASSWORD}
+
+    def auth(token: str) -> dict:
+        return {"Authorization": f"Bearer {token}"}
+
+    return {
+        "login": lambda i, token: ("POST", "/api/auth/login", {
+            "data": login, "headers": {"X-Forwarded-For": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"}
+        }),
+        "create_message": lambda i, token: ("POST", "/api/messages", {"json": contact}),
+        "create_demo_request": lambda i, token: ("POST", "/api/demo-requests", {"json": demo}),
+        "me": lambda i, token: ("GET", "/api/auth/me", {"headers": auth(token)}),
+        "list_messages": lambda i, token: ("GET", "/api/messages", {"headers": auth(token)}),
+        "list_messages_unread": lambda i, token: ("GET", "/api/messages?is_read=false", {"headers": auth(token)}),
+        "list_demo_requests": lambda i, token: ("GET", "/api/demo-requests", {"headers": auth(token)}),
+        "list_users": lambda i, token: ("GET", "/api/auth/users", {"headers": auth(token)}),
+        "message_replies": lambda i, token: ("GET", f"/api/messages/{message_id()}/replies", {"headers": auth(token)}),
+        "search_messages": lambda i, token: ("GET", "/api/messages/search?q=kubernetes+audit", {"headers": auth(token)}),
+        "mark_read": lambda i, token: ("PATCH", f"/api/messages/{message_id()}/mark-read", {"headers": auth(token)}),
+        "reply": lambda i, token: (lambda mid: ("POST", f"/api/messages/{mid}/reply", {
+            "headers": auth(token),
+            "json": {"message_id": mid, "reply_from_email": "support@bench.example.com",
+                     "reply_subject": "Re: Benchmark", "reply_body": "Thanks for reaching out."}
+        }))(message_id()),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, build, token: str, requests: int, concurrency: int) -> dict:
+    """Send `requests` requests from `concurrency` concurrent clients"""
+    counter = itertools.count()
+    latencies = []
+    statuses = {}
+
+    async def worker():
+        while (i := next(counter)) < requests:
+            method, url, kwargs = build(i, token)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            await response.aread()
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2),
+        },
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def free_port() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def drive(base_url: str, scenarios: dict, names: list[str], requests: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": BENCH_ADMIN_USERNAME, "password": BENCH_ADMIN_PASSWORD},
+            headers={"X-Forwarded-For": "192.0.2.1"}
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        results = {}
+        for name in names:
+            # Warm up connections and caches before measuring
+            await run_scenario(client, scenarios[name], token, concurrency, concurrency)
+            results[name] = await run_scenario(client, scenarios[name], token, requests, concurrency)
+            print(f"   {name}: p50 {results[name]['latency_ms']['p50']} ms, "
+                  f"{results[name]['throughput_rps']} req/s", file=sys.stderr)
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", choices=DATASETS, default="10k")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--scenarios", help="Comma-separated subset of scenarios to run")
+    parser.add_argument("--db", help="Seeded database to reuse instead of seeding a new one")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="api-bench-"))
+    db_path = Path(args.db) if args.db else workdir / "bench.db"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DEBUG="true",
+        SENDGRID_API_KEY="",
+        RATE_LIMIT_DB_PATH=str(workdir / "ratelimit.db"),
+        # Endpoints over their @query_budget answer 500 and show up in the report
+        QUERY_BUDGET_ENFORCE="true",
+    )
+
+    seeding = {}
+    if not args.db:
+        print(f"🌱 Seeding {args.dataset} dataset into {db_path}", file=sys.stderr)
+        seeded = subprocess.run(
+            [sys.executable, "-c",
+             "import json, sys; from benchmarks.seed import seed, DATASETS; "
+             "print(json.dumps(seed(**DATASETS[sys.argv[1]])))", args.dataset],
+            cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        seeding = json.loads(seeded.stdout.strip().splitlines()[-1])
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(args.workers), "--no-access-log"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{base_url}/api/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline or server.poll() is not None:
+                raise SystemExit("Server did not start")
+            time.sleep(0.2)
+
+        message_count = DATASETS[args.dataset]["messages"]
+        scenarios = build_scenarios(message_count, random.Random(7))
+        names = args.scenarios.split(",") if args.scenarios else list(scenarios)
+        results = asyncio.run(drive(base_url, scenarios, names, args.requests, args.concurrency))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "dataset": args.dataset,
+        "seeding": seeding,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Benchmark dataset sizes and credentials (no app imports, safe for load drivers)"""
+
+# Login used by benchmark clients
+BENCH_ADMIN_USERNAME = "bench_admin"
+BENCH_ADMIN_PASSWORD = "Bench!Passw0rd"
+
+# Named dataset sizes
+DATASETS = {
+    "10k": {"messages": 10_000, "replies_per_message": 0.5, "demo_requests": 2_000, "users": 20},
+    "100k": {"messages": 100_000, "replies_per_message": 0.5, "demo_requests": 20_000, "users": 50},
+    "1m": {"messages": 1_000_000, "replies_per_message": 0.5, "demo_requests": 200_000, "users": 100},
+}
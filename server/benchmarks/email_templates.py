@@ -0,0 +1,84 @@
+"""
+Email rendering micro-benchmark
+
+Measures how long it takes to build the body of each email, comparing:
+
+- legacy: the previous inline f-string (HTML only, no escaping)
+- templates: the precompiled Jinja2 templates (escaped HTML + plain text)
+
+Usage:
+    python -m benchmarks.email_templates [--emails 20000]
+"""
+import argparse
+import json
+import time
+
+from app.config.settings import settings
+from app.services.email_templates import email_templates
+
+CONTEXT = {
+    "name": "Jane <Doe>",
+    "email": "jane.doe@example.com",
+    "subject": "Pricing & availability",
+    "message": "Hello,\n\nWe would like to know more about your platform. " * 20,
+}
+
+
+def legacy_contact_notification(name: str, email: str, subject: str, message: str) -> str:
+    """The inline f-string EmailService used before, kept here as the comparison point"""
+    return f"""
+            <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                        <h2 style="color: #10b981; border-bottom: 2px solid #10b981; padding-bottom: 10px;">
+                            🔔 New Contact Message
+                        </h2>
+                        
+                        <div style="background-color: #f9fafb; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                            <p><strong>From:</strong> {name}</p>
+                            <p><strong>Email:</strong> <a href="mailto:{email}">{email}</a></p>
+                            <p><strong>Subject:</strong> {subject}</p>
+                        </div>
+                        
+                        <div style="background-color: #fff; padding: 20px; border-left: 4px solid #10b981; margin: 20px 0;">
+                            <p style="margin: 0; white-space: pre-wrap;">{message}</p>
+                        </div>
+                        
+                        <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e5e7eb; color: #6b7280; font-size: 12px;">
+                            <p>This notification was sent from your IRONHEX website contact form.</p>
+                            <p style="margin: 0;">© {settings.SENDGRID_FROM_NAME} - Technology Solutions</p>
+                        </div>
+                    </div>
+                </body>
+            </html>
+            """
+
+
+def run(render, emails: int) -> float:
+    """Return mean microseconds per email"""
+    for _ in range(200):
+        render()
+    start = time.perf_counter()
+    for _ in range(emails):
+        render()
+    return (time.perf_counter() - start) / emails * 1e6
+
+
+def main(emails: int) -> dict:
+    variants = {
+        "legacy": lambda: legacy_contact_notification(**CONTEXT),
+        "templates": lambda: email_templates.render("contact_notification", **CONTEXT),
+    }
+    results = {name: run(render, emails) for name, render in variants.items()}
+    return {
+        "emails": emails,
+        "mean_us_per_email": {name: round(us, 2) for name, us in results.items()},
+        "emails_per_second": {name: round(1e6 / us) for name, us in results.items()},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(main(args.emails), indent=2))
@@ -0,0 +1,130 @@
+"""
+Outbound email transport load test
+
+Starts a local stand-in for the SendGrid API (fixed latency, and a share
+of 429 responses) and sends a burst of emails through EmailService while
+measuring how long the event loop is blocked, comparing:
+
+- blocking: a synchronous HTTP call per email inside async code, with a
+  new connection each time (how the SendGrid SDK was used before)
+- async: the pooled SendGridTransport, concurrency capped by
+  EMAIL_HTTP_MAX_CONNECTIONS
+
+Usage:
+    python -m benchmarks.email_transport [--emails 200] [--latency-ms 50] [--throttle 0.1]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.services.email import EmailDeliveryError, EmailService
+from app.services.email_transport import SendGridTransport, build_message
+
+
+def build_stand_in(latency: float, throttle: float) -> Starlette:
+    """A minimal /v3/mail/send that answers 202, or 429 for a share of requests"""
+    async def mail_send(request: Request) -> Response:
+        await request.body()
+        await asyncio.sleep(latency)
+        if random.random() < throttle:
+            return Response(status_code=429, headers={"Retry-After": "0"})
+        return Response(status_code=202)
+
+    return Starlette(routes=[Route("/v3/mail/send", mail_send, methods=["POST"])])
+
+
+def start_stand_in(app: Starlette) -> str:
+    """Serve the stand-in from a background thread and return its base URL"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Longest delay, in ms, between when a sleep should end and when it does"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst * 1000
+
+
+async def run(send, emails: int) -> dict:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(measure_loop_lag(stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(send(i) for i in range(emails)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    return {
+        "seconds": round(elapsed, 2),
+        "emails_per_second": round(emails / elapsed, 1),
+        "sent": sum(results),
+        "max_event_loop_block_ms": round(await lag, 1),
+    }
+
+
+async def main(emails: int, base_url: str) -> dict:
+    message = build_message(
+        "noreply@example.com", "Bench", "inbox@example.com", None,
+        "Load test", "Hello", "<p>Hello</p>"
+    )
+
+    async def send_blocking(i: int) -> bool:
+        # New connection per email and the event loop is blocked meanwhile
+        with httpx.Client(base_url=base_url) as client:
+            response = client.post("/v3/mail/send", json=message)
+        return response.status_code == 202
+
+    service = EmailService()
+    service.transport = SendGridTransport(
+        api_key="bench", base_url=base_url, max_connections=10, timeout=10, max_retries=3
+    )
+
+    async def send_async(i: int) -> bool:
+        try:
+            return await service.send_contact_notification(
+                name=f"Visitor {i}", email="visitor@example.com", subject="Load test", message="Hello"
+            )
+        except EmailDeliveryError:
+            return False
+
+    results = {
+        "blocking": await run(send_blocking, emails),
+        "async": await run(send_async, emails),
+    }
+    await service.aclose()
+    return {"emails": emails, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--throttle", type=float, default=0.1, help="Share of requests answered with 429")
+    args = parser.parse_args()
+
+    base_url = start_stand_in(build_stand_in(args.latency_ms / 1000, args.throttle))
+    print(json.dumps(asyncio.run(main(args.emails, base_url)), indent=2))
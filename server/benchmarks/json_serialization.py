@@ -0,0 +1,130 @@
+"""
+List serialization benchmark
+
+Loads N messages and N demo requests and times the full fetch + encode of
+each list, comparing:
+
+- models: ORM objects validated through the response_model by FastAPI's
+  serialize_response and rendered with JSONResponse (the previous path)
+- fast: column tuples from schema_columns() encoded by json_rows()
+
+The database is chosen with DATABASE_URL, which must be set before this
+module is imported; it is seeded when it has fewer than N rows.
+
+Usage:
+    DEBUG=true DATABASE_URL=sqlite:///bench.db python -m benchmarks.json_serialization [--rows 10000]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import func, select
+
+from app.config.database import AsyncSessionLocal, async_engine, init_db
+from app.models import DemoRequest, Message, MessageReply
+from app.schemas import DemoRequestOut, MessageOut
+from app.utils.fast_json import json_rows, schema_columns
+from benchmarks.seed import seed
+
+
+def _reply_count():
+    return (
+        select(func.count(MessageReply.id))
+        .where(MessageReply.message_id == Message.id)
+        .correlate(Message)
+        .scalar_subquery()
+    )
+
+
+async def models_messages(db, rows: int) -> bytes:
+    result = await db.execute(select(Message, _reply_count()).order_by(Message.id).limit(rows))
+    content = [
+        {
+            "id": msg.id, "name": msg.name, "email": msg.email, "subject": msg.subject,
+            "message": msg.message, "timestamp": msg.timestamp, "delivered": msg.delivered,
+            "is_read": msg.is_read, "read_at": msg.read_at, "reply_count": replies
+        }
+        for msg, replies in result.all()
+    ]
+    field = create_model_field(name="Response", type_=list[MessageOut], mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def fast_messages(db, rows: int) -> bytes:
+    result = await db.execute(
+        select(*schema_columns(MessageOut, Message, reply_count=_reply_count()))
+        .order_by(Message.id).limit(rows)
+    )
+    return json_rows(list(result.keys()), result.all()).body
+
+
+async def models_demo_requests(db, rows: int) -> bytes:
+    result = await db.execute(select(DemoRequest).order_by(DemoRequest.id).limit(rows))
+    field = create_model_field(name="Response", type_=list[DemoRequestOut], mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=result.scalars().all())).body
+
+
+async def fast_demo_requests(db, rows: int) -> bytes:
+    result = await db.execute(
+        select(*schema_columns(DemoRequestOut, DemoRequest)).order_by(DemoRequest.id).limit(rows)
+    )
+    return json_rows(list(result.keys()), result.all()).body
+
+
+async def run(build, rows: int, repeat: int) -> dict:
+    """Time one list path; returns median/min milliseconds and body size"""
+    timings = []
+    async with AsyncSessionLocal() as db:
+        body = await build(db, rows)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await build(db, rows)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "bytes": len(body),
+    }
+
+
+async def main(rows: int, repeat: int) -> dict:
+    init_db()
+    async with AsyncSessionLocal() as db:
+        messages = (await db.execute(select(func.count(Message.id)))).scalar()
+        demo_requests = (await db.execute(select(func.count(DemoRequest.id)))).scalar()
+    if messages < rows or demo_requests < rows:
+        await asyncio.to_thread(seed, messages=rows, replies_per_message=0.5, demo_requests=rows, users=5)
+
+    report = {"rows": rows, "repeat": repeat}
+    try:
+        await _compare(report, rows, repeat)
+    finally:
+        await async_engine.dispose()
+    return report
+
+
+async def _compare(report: dict, rows: int, repeat: int) -> None:
+    for name, models, fast in [
+        ("messages", models_messages, fast_messages),
+        ("demo_requests", models_demo_requests, fast_demo_requests),
+    ]:
+        # Both paths must produce the same document
+        async with AsyncSessionLocal() as db:
+            assert json.loads(await models(db, rows)) == json.loads(await fast(db, rows))
+        results = {"models": await run(models, rows, repeat), "fast": await run(fast, rows, repeat)}
+        results["speedup"] = round(results["models"]["median_ms"] / results["fast"]["median_ms"], 2)
+        report[name] = results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.rows, args.repeat)), indent=2))
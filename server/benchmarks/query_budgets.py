@@ -0,0 +1,151 @@
+"""
+Query budget smoke pass
+
+Seeds a fresh SQLite database (see benchmarks.seed), starts the application
+in-process on it with QUERY_BUDGET_ENFORCE on, and calls every hot
+endpoint. A request that runs more statements than its endpoint's
+@query_budget is answered with 500, so any unexpected status fails the run.
+It also checks that listing a message's replies takes as many statements
+for many replies as for one.
+
+Prints how many statements each request executed, and exits
+with status 1 on a failure, which makes it usable as a CI gate.
+
+Usage:
+    python -m benchmarks.query_budgets [--messages 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks.datasets import BENCH_ADMIN_PASSWORD, BENCH_ADMIN_USERNAME
+
+
+def hot_requests(auth: dict) -> list[tuple[str, str, dict]]:
+    """(method, url, request kwargs) for every endpoint on a hot path"""
+    return [
+        ("GET", "/api/auth/me", {"headers": auth}),
+        ("GET", "/api/auth/users", {"headers": auth}),
+        ("GET", "/api/messages?limit=50", {"headers": auth}),
+        ("GET", "/api/messages/summary?today_start=2000-01-01T00:00:00", {"headers": auth}),
+        ("GET", "/api/messages/search?q=security", {"headers": auth}),
+        ("PATCH", "/api/messages/2/mark-read", {"headers": auth}),
+        ("POST", "/api/messages/batch", {"headers": auth, "json": {"ids": [3, 4, 5], "is_read": True}}),
+        ("POST", "/api/messages/6/reply", {"headers": auth, "json": {
+            "message_id": 6, "reply_from_email": "support@example.com",
+            "reply_subject": "Re: Benchmark", "reply_body": "<p>Thanks</p>"
+        }}),
+        # Message 6 has at least the reply above, so a per-reply query would be counted
+        ("GET", "/api/messages/6/replies", {"headers": auth}),
+        ("GET", "/api/demo-requests", {"headers": auth}),
+        ("GET", "/api/demo-requests/search?q=security", {"headers": auth}),
+        ("PATCH", "/api/demo-requests/1/mark-read", {"headers": auth}),
+        ("PATCH", "/api/demo-requests/2", {"headers": auth, "json": {"status": "scheduled", "notes": "Call"}}),
+        ("POST", "/api/demo-requests/batch", {"headers": auth, "json": {"operations": [
+            {"ids": [3, 4], "status": "contacted"}, {"ids": [5], "notes": "Follow up"}
+        ]}}),
+        ("POST", "/api/events/ticket", {"headers": auth}),
+        ("GET", "/api/export/messages", {"headers": auth}),
+        ("GET", "/api/export/demo-requests", {"headers": auth}),
+        ("POST", "/api/messages", {"json": {
+            "name": "Bench Visitor", "email": "visitor@example.com",
+            "subject": "Benchmark", "message": "Hello from the budget smoke pass"
+        }}),
+        ("POST", "/api/demo-requests", {"json": {
+            "platform_id": "p1", "platform_name": "Platform 1", "platform_category": "security",
+            "full_name": "Bench Prospect", "email": "prospect@example.com", "phone": "+216 00 000 000"
+        }}),
+    ]
+
+
+def check_replies_statement_count(client, admins: list[dict], replies: int = 6) -> list[str]:
+    """
+    Listing replies must take the same statements for one reply as for many
+
+    Replies are written by several admins, so a per-reply lookup of the
+    replies or of their admin usernames shows up as a higher count.
+    """
+    message = client.post("/api/messages", json={
+        "name": "Thread Visitor", "email": "thread@example.com",
+        "subject": "Thread", "message": "A message that gets many replies"
+    }).json()
+
+    def reply(auth: dict) -> None:
+        client.post(f"/api/messages/{message['id']}/reply", headers=auth, json={
+            "message_id": message["id"], "reply_from_email": "support@example.com",
+            "reply_subject": "Re: Thread", "reply_body": "<p>Reply</p>"
+        }).raise_for_status()
+
+    def list_replies() -> tuple[int, int]:
+        response = client.get(f"/api/messages/{message['id']}/replies", headers=admins[0])
+        response.raise_for_status()
+        return len(response.json()), int(response.headers["x-db-query-count"])
+
+    reply(admins[0])
+    _, single = list_replies()
+    for i in range(1, replies):
+        reply(admins[i % len(admins)])
+    count, many = list_replies()
+
+    print(f"{'✅' if single == many else '❌'} GET /api/messages/{{id}}/replies: "
+          f"{single} statements for 1 reply, {many} for {count}")
+    if single != many:
+        return [f"Listing {count} replies took {many} statements, 1 reply took {single}"]
+    return []
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Call every hot endpoint with query budgets enforced")
+    parser.add_argument("--messages", type=int, default=500, help="Messages to seed (demo requests: a fifth)")
+    args = parser.parse_args()
+
+    # The app reads its settings at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='query-budgets-')}/budgets.db"
+    os.environ["QUERY_BUDGET_ENFORCE"] = "true"
+    os.environ.setdefault("DEBUG", "true")
+    # Budgets cover the authenticated user lookup; measure every request as a cache miss
+    os.environ["USER_CACHE_TTL_SECONDS"] = "0"
+
+    from fastapi.testclient import TestClient
+
+    import main as server
+    from benchmarks.seed import seed
+
+    seed(messages=args.messages, replies_per_message=0.5, demo_requests=max(args.messages // 5, 5), users=5)
+
+    failures = []
+    with TestClient(server.app) as client:
+        login = client.post("/api/auth/login", data={"username": BENCH_ADMIN_USERNAME, "password": BENCH_ADMIN_PASSWORD})
+        if login.status_code != 200:
+            print(f"❌ Benchmark admin login failed: {login.status_code} {login.text}")
+            return 1
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        # Seeded admins share the benchmark password
+        second = client.post("/api/auth/login", data={"username": "admin1", "password": BENCH_ADMIN_PASSWORD})
+        second.raise_for_status()
+        admins = [auth, {"Authorization": f"Bearer {second.json()['access_token']}"}]
+
+        print(f"\n{'request':<62}{'status':>7}{'queries':>9}")
+        for method, url, kwargs in hot_requests(auth):
+            response = client.request(method, url, **kwargs)
+            ok = response.status_code == 200
+            print(f"{'✅' if ok else '❌'} {method + ' ' + url:<60}{response.status_code:>7}"
+                  f"{response.headers.get('x-db-query-count', '-'):>9}")
+            if not ok:
+                failures.append(f"{method} {url}: {response.text[:500]}")
+
+        print()
+        failures.extend(check_replies_statement_count(client, admins))
+
+    if failures:
+        print("\n❌ Requests failed or exceeded their query budget:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    print("\n✅ Every hot endpoint within its query budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Security headers middleware micro-benchmark
+
+Measures the per-request overhead of the security headers middleware by
+calling a minimal Starlette app directly over ASGI (no network), comparing:
+
+- baseline: no middleware
+- legacy: the previous BaseHTTPMiddleware implementation
+- asgi: the current pure-ASGI SecurityHeadersMiddleware
+
+Usage:
+    python -m benchmarks.security_headers [--requests 20000]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.config.settings import settings
+from app.middleware.security_headers import SecurityHeadersMiddleware, build_security_headers
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation, kept here as the comparison point"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in build_security_headers(settings.DEBUG):
+            response.headers[name.decode("latin-1")] = value.decode("latin-1")
+        return response
+
+
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+
+def build_app(middleware: list) -> Starlette:
+    return Starlette(routes=[Route("/api/health", health)], middleware=middleware)
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/health",
+    "raw_path": b"/api/health",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"localhost")],
+    "client": ("127.0.0.1", 12345),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+async def run(app, requests: int) -> float:
+    """Return mean microseconds per request"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up
+    for _ in range(200):
+        await app(dict(SCOPE), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> dict:
+    variants = {
+        "baseline": build_app([]),
+        "legacy": build_app([Middleware(LegacySecurityHeadersMiddleware)]),
+        "asgi": build_app([Middleware(SecurityHeadersMiddleware)]),
+    }
+    results = {name: await run(app, requests) for name, app in variants.items()}
+    return {
+        "requests": requests,
+        "mean_us_per_request": {name: round(us, 2) for name, us in results.items()},
+        "overhead_us": {
+            "legacy": round(results["legacy"] - results["baseline"], 2),
+            "asgi": round(results["asgi"] - results["baseline"], 2),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.requests)), indent=2))
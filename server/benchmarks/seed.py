@@ -0,0 +1,168 @@
+"""
+Seed a SQLite database with a synthetic dataset for benchmarks
+
+Rows are written with executemany in large batches inside one transaction
+per table, so a million messages take seconds rather than hours. All seeded
+users share one bcrypt hash.
+
+The database is chosen with DATABASE_URL, which must be set before this
+module is imported (the app reads it at import time).
+
+Usage:
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.seed --messages 100000
+"""
+import argparse
+import datetime
+import json
+import random
+import time
+
+from sqlalchemy import func, insert, select
+
+from app.config.database import engine, init_db
+from app.models import DemoRequest, Message, MessageReply, User
+from app.services.auth import get_password_hash
+from benchmarks.datasets import BENCH_ADMIN_PASSWORD, BENCH_ADMIN_USERNAME, DATASETS
+
+BATCH_SIZE = 10_000
+
+WORDS = (
+    "platform security cloud migration audit pricing demo integration support "
+    "network data analytics dashboard invoice contract deployment kubernetes "
+    "firewall backup monitoring training consulting timeline budget proposal"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _insert_batches(conn, model, rows) -> int:
+    """Insert an iterable of row dicts in BATCH_SIZE chunks"""
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            conn.execute(insert(model), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+        total += len(batch)
+    return total
+
+
+def seed(messages: int, replies_per_message: float, demo_requests: int, users: int, seed: int = 42) -> dict:
+    """
+    Create the schema and fill it with synthetic rows
+
+    Args:
+        messages: Contact messages to create
+        replies_per_message: Average admin replies per message
+        demo_requests: Demo requests to create
+        users: Admin users to create (including the benchmark admin)
+        seed: Random seed, so the same arguments give the same dataset
+
+    Returns:
+        Row counts and seconds spent per table
+    """
+    rng = random.Random(seed)
+    init_db()
+    start = datetime.datetime.utcnow() - datetime.timedelta(days=365)
+    step = datetime.timedelta(days=365) / max(messages, 1)
+    hashed = get_password_hash(BENCH_ADMIN_PASSWORD)
+    report = {}
+
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(Message)).scalar():
+            raise SystemExit("Database is not empty; seed a fresh file")
+
+        t = time.perf_counter()
+        report["users"] = _insert_batches(conn, User, (
+            {
+                "username": BENCH_ADMIN_USERNAME if i == 0 else f"admin{i}",
+                "email": f"admin{i}@bench.example.com",
+                "hashed_password": hashed,
+                "is_active": True,
+                "is_admin": True,
+                "created_at": start + datetime.timedelta(minutes=i),
+            }
+            for i in range(max(users, 1))
+        ))
+        admin_ids = list(range(1, max(users, 1) + 1))
+        report["users_seconds"] = round(time.perf_counter() - t, 2)
+
+        t = time.perf_counter()
+        report["messages"] = _insert_batches(conn, Message, (
+            {
+                "name": f"Visitor {i}",
+                "email": f"visitor{i % 5000}@example.com",
+                "subject": _text(rng, 5),
+                "message": _text(rng, 60),
+                "timestamp": start + step * i,
+                "delivered": True,
+                "is_read": rng.random() < 0.7,
+            }
+            for i in range(messages)
+        ))
+        report["messages_seconds"] = round(time.perf_counter() - t, 2)
+
+        t = time.perf_counter()
+        report["message_replies"] = _insert_batches(conn, MessageReply, (
+            {
+                "message_id": rng.randint(1, messages),
+                "admin_id": rng.choice(admin_ids),
+                "reply_from_email": "support@bench.example.com",
+                "reply_subject": "Re: " + _text(rng, 4),
+                "reply_body": _text(rng, 40),
+                "sent_at": start + step * i,
+                "delivered": True,
+            }
+            for i in range(int(messages * replies_per_message))
+        ) if messages else ())
+        report["message_replies_seconds"] = round(time.perf_counter() - t, 2)
+
+        t = time.perf_counter()
+        demo_step = datetime.timedelta(days=365) / max(demo_requests, 1)
+        report["demo_requests"] = _insert_batches(conn, DemoRequest, (
+            {
+                "platform_id": f"platform-{i % 12}",
+                "platform_name": f"Platform {i % 12}",
+                "platform_category": "security",
+                "full_name": f"Prospect {i}",
+                "email": f"prospect{i}@example.com",
+                "phone": "+216 00 000 000",
+                "company_name": f"Company {i % 800}",
+                "message": _text(rng, 30),
+                "timestamp": start + demo_step * i,
+                "is_read": rng.random() < 0.5,
+                "status": rng.choice(["pending", "scheduled", "completed"]),
+            }
+            for i in range(demo_requests)
+        ))
+        report["demo_requests_seconds"] = round(time.perf_counter() - t, 2)
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", choices=DATASETS, help="Named dataset size (overrides the counts)")
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--replies-per-message", type=float, default=0.5)
+    parser.add_argument("--demo-requests", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    sizes = DATASETS[args.dataset] if args.dataset else {
+        "messages": args.messages,
+        "replies_per_message": args.replies_per_message,
+        "demo_requests": args.demo_requests,
+        "users": args.users,
+    }
+    print(json.dumps(seed(**sizes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
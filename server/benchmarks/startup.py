@@ -0,0 +1,100 @@
+"""
+Startup time report
+
+Imports `main` in fresh interpreters with `python -X importtime` and
+reports:
+
+- the time to import main (the median of several runs)
+- the import time spent in each top-level package (self time, so the
+  packages add up to the total)
+- any module from LAZY_MODULES that was imported eagerly. Those are only
+  meant to load on first use.
+
+With --budget-ms the command exits with status 1 when the import time is
+over budget or a lazy module was imported at startup. That makes it usable
+as a CI gate.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--top 15] [--budget-ms 1500]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Dependencies the app imports on first use; loading any of them while
+# importing main is a regression
+LAZY_MODULES = ("bcrypt", "jose", "cryptography", "httpx")
+
+
+def profile_import() -> list[tuple[str, int, int]]:
+    """
+    Import main once in a fresh interpreter
+
+    Returns:
+        (module, self microseconds, cumulative microseconds) for every imported module
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("DEBUG", "true")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing main failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report and enforce the import time of the API")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time (the median is reported)")
+    parser.add_argument("--top", type=int, default=15, help="Top-level packages to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if importing main takes longer")
+    args = parser.parse_args()
+
+    # The first import compiles bytecode for every module; keep it out of the timings
+    profile_import()
+
+    runs = [profile_import() for _ in range(args.runs)]
+    totals = [dict((name, cumulative) for name, _, cumulative in modules)["main"] / 1000 for modules in runs]
+    total_ms = statistics.median(totals)
+
+    by_package = defaultdict(int)
+    median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    for name, self_us, _ in median_run:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"\nimport main: {total_ms:.0f} ms (median of {args.runs}, min {min(totals):.0f} ms, max {max(totals):.0f} ms)\n")
+    print(f"{'package':<28}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{package:<28}{self_us / 1000:>10.1f}{self_us / 10 / total_ms:>7.0f}%")
+
+    imported = {name.split(".")[0] for name, _, _ in median_run}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    if eager:
+        print(f"\n❌ Imported at startup but meant to load lazily: {', '.join(eager)}")
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"\n❌ Startup import time {total_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+            return 1
+        if eager:
+            return 1
+        print(f"\n✅ Startup import time within the {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Event stream connection check
+
+Starts the application under uvicorn with a database pool of a single
+connection, opens several admin event streams (one with the Authorization
+header, the others with stream tickets) and keeps them open while a
+visitor submits the contact form and an admin lists messages. Open streams
+must not hold pooled connections, so both requests have to succeed quickly
+and every stream has to receive the message.created event.
+
+Exits with status 1 on a failure, which makes it usable as a CI gate.
+
+Usage:
+    python -m benchmarks.stream_connections [--streams 3]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.api_bench import free_port
+from benchmarks.datasets import BENCH_ADMIN_PASSWORD, BENCH_ADMIN_USERNAME
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Seconds a request may take while the streams are open; well under the pool timeout
+REQUEST_TIMEOUT_SECONDS = 3
+
+
+async def read_until(lines, marker: str) -> None:
+    async for line in lines:
+        if marker in line:
+            return
+
+
+async def check_streams(base_url: str, streams: int) -> list[str]:
+    """Hold streams open while other requests run; returns the failures"""
+    failures = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=REQUEST_TIMEOUT_SECONDS) as client:
+        login = await client.post("/api/auth/login", data={
+            "username": BENCH_ADMIN_USERNAME, "password": BENCH_ADMIN_PASSWORD
+        })
+        login.raise_for_status()
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        urls = []
+        for i in range(streams):
+            if i == 0:
+                urls.append(("/api/events", auth))
+            else:
+                ticket = await client.post("/api/events/ticket", headers=auth)
+                ticket.raise_for_status()
+                urls.append((f"/api/events?ticket={ticket.json()['ticket']}", {}))
+
+        async with httpx.AsyncClient(base_url=base_url, timeout=None) as stream_client:
+            opened = []
+            try:
+                for url, headers in urls:
+                    request = stream_client.build_request("GET", url, headers=headers)
+                    response = await stream_client.send(request, stream=True)
+                    lines = response.aiter_lines()
+                    opened.append((response, lines))
+                    if response.status_code != 200:
+                        failures.append(f"GET {url.split('?')[0]}: {response.status_code}")
+                        return failures
+                    await asyncio.wait_for(read_until(lines, "retry:"), REQUEST_TIMEOUT_SECONDS)
+                print(f"✅ {streams} event streams open")
+
+                for method, url, kwargs in (
+                    ("POST", "/api/messages", {"json": {
+                        "name": "Stream Check", "email": "visitor@example.com",
+                        "subject": "Streams", "message": "Sent while event streams are open"
+                    }}),
+                    ("GET", "/api/messages?limit=10", {"headers": auth}),
+                ):
+                    start = time.perf_counter()
+                    try:
+                        response = await client.request(method, url, **kwargs)
+                        status = response.status_code
+                    except httpx.TimeoutException:
+                        status = "timeout"
+                    elapsed = time.perf_counter() - start
+                    print(f"{'✅' if status == 200 else '❌'} {method} {url}: {status} in {elapsed:.2f}s")
+                    if status != 200:
+                        failures.append(f"{method} {url}: {status} while streams were open")
+
+                for index, (_, lines) in enumerate(opened):
+                    try:
+                        await asyncio.wait_for(read_until(lines, "message.created"), REQUEST_TIMEOUT_SECONDS)
+                    except asyncio.TimeoutError:
+                        failures.append(f"Stream {index} did not receive message.created")
+            finally:
+                for response, _ in opened:
+                    await response.aclose()
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that open event streams do not hold database connections")
+    parser.add_argument("--streams", type=int, default=3, help="Event streams to hold open")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="stream-check-"))
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{workdir / 'streams.db'}",
+        DEBUG="true",
+        SENDGRID_API_KEY="",
+        RATE_LIMIT_DB_PATH=str(workdir / "ratelimit.db"),
+        # Any connection held by a stream starves the other requests
+        DB_POOL_SIZE="1",
+        DB_MAX_OVERFLOW="0",
+        DB_POOL_TIMEOUT=str(REQUEST_TIMEOUT_SECONDS - 1),
+    )
+    subprocess.run(
+        [sys.executable, "-c", "from benchmarks.seed import seed; seed(messages=10, replies_per_message=0, "
+                               "demo_requests=0, users=1)"],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", "1", "--no-access-log"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{base_url}/api/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline or server.poll() is not None:
+                print("❌ Server did not start")
+                return 1
+            time.sleep(0.2)
+
+        failures = asyncio.run(check_streams(base_url, args.streams))
+    finally:
+        server.terminate()
+        server.wait()
+
+    if failures:
+        print("\n❌ Open event streams starved other requests:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    print("\n✅ Open event streams hold no database connections")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,18 +7,30 @@ user authentication, and demo requests with SendGrid email integration.
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.config.database import init_db, SessionLocal
+from app.config.database import (
+    engine, async_engine, read_async_engine, archive_async_engine, READ_CONSISTENCY_HEADER
+)
 from app.config.settings import settings
-from app.routers import messages, auth, demo
-from app.utils import initialize_database
-from app.middleware import SecurityHeadersMiddleware
+from app.routers import messages, auth, demo, events, export, metrics, archive
+from app.bootstrap import ensure_bootstrapped
+from app.middleware import SecurityHeadersMiddleware, MetricsMiddleware, QueryDebugMiddleware, rate_limiter
+from app.services.password_hasher import password_hasher
+from app.services.outbox import outbox_dispatcher
+from app.services.events import event_broker
+from app.services.archive import archive_scheduler
+from app.services.email import email_service
+from app.services.metrics import mark_process_dead
+from app.utils.query_stats import install_query_listeners
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="Secure API for IRONHEX website contact management"
+    description="Secure API for IRONHEX website contact management",
+    # orjson encodes response bodies several times faster than the json module
+    default_response_class=ORJSONResponse
 )
 
 # Add security headers middleware
@@ -26,24 +38,39 @@ app.add_middleware(SecurityHeadersMiddleware)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database and create super admins on startup"""
+    """Verify the database is bootstrapped and start background work"""
     try:
         print("🚀 Starting application...")
-        init_db()
-        print("✅ Database initialized")
-        
-        db = SessionLocal()
-        try:
-            initialize_database(db)
-            print("✅ Super admins checked/created")
-        finally:
-            db.close()
+        # Normally a no-op: `python -m app.bootstrap` already ran before the
+        # workers started, so this only checks the recorded schema version
+        if not ensure_bootstrapped():
+            print("✅ Database schema up to date")
+        outbox_dispatcher.start()
+        archive_scheduler.start()
+        rate_limiter.start()
         print("✅ Application startup complete!")
     except Exception as e:
         print(f"❌ Startup error: {e}")
         import traceback
         traceback.print_exc()
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work and release pooled resources"""
+    await outbox_dispatcher.stop()
+    await archive_scheduler.stop()
+    await rate_limiter.stop()
+    await event_broker.stop()
+    await email_service.aclose()
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
+    if archive_async_engine is not None:
+        await archive_async_engine.dispose()
+    password_hasher.shutdown()
+    mark_process_dead(os.getpid())
+
 # Configure CORS
 origins = [
     settings.VITE_DEV_ORIGIN,
@@ -75,7 +102,8 @@ if not settings.DEBUG:
         allow_origins=production_origins,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-        allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
+        allow_headers=["Content-Type", "Authorization", "X-Requested-With", READ_CONSISTENCY_HEADER],
+        expose_headers=["X-Next-Cursor", "ETag"],
         max_age=600,  # Cache preflight requests for 10 minutes
     )
 else:
@@ -86,12 +114,34 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
+# Count and time SQL statements per request
+install_query_listeners(engine)
+install_query_listeners(async_engine.sync_engine)
+if read_async_engine is not None:
+    install_query_listeners(read_async_engine.sync_engine)
+if archive_async_engine is not None:
+    install_query_listeners(archive_async_engine.sync_engine)
+
+# Query count headers, slow/N+1 query logs and query budget checks
+if settings.DEBUG or settings.QUERY_BUDGET_ENFORCE:
+    app.add_middleware(QueryDebugMiddleware, enforce=settings.QUERY_BUDGET_ENFORCE)
+
+# Request metrics (added last so it is outermost and times everything)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(messages.router)
 app.include_router(auth.router)
 app.include_router(demo.router)
+app.include_router(events.router)
+app.include_router(export.router)
+app.include_router(archive.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 @app.get("/")